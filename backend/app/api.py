@@ -1,69 +1,126 @@
-from .models import ReadProject, ReadRole, ReadRolePermissions, ReadTask, ReadTaskStatus, ReadUser, FilteredReadUser, WriteProject, WriteRole, WriteTask, WriteTaskStatus, WriteUser, Login, ChangePassword, JWTPayloadBase
-from .utils import write_to_db, read_from_db, update_in_db, hash_password, verify_password, refresh_token, issue_tokens_and_set_cookie, verify_access_token
-from fastapi import APIRouter, Depends, status, HTTPException, Response, Security
+from .models import ReadProject, ReadRole, ReadRolePermissions, ReadTask, ReadTaskStatus, ReadUser, FilteredReadUser, ExpandedReadProject, ExpandedReadTask, ProjectSummary, TaskSummary, WriteProject, WriteRole, WriteTask, WriteTaskStatus, WriteUser, PatchProject, PatchRole, PatchTask, PatchTaskStatus, SearchResult, Board, BatchOperation, Login, ChangePassword, JWTPayloadBase
+from .utils import write_to_db, read_from_db, update_in_db, hash_password_async, verify_password_async, refresh_token, issue_tokens_and_set_cookie, verify_access_token, verify_monitoring_access, authenticate_access_token
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Request, Response, Security, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from datetime import date, datetime, timezone
-from google.auth.transport import requests
+from .expand import task_expand, project_expand, expand_rows
+from .conditional import reference_data_response
+from .pagination import PageParams
+from .fast_json import fast_path_enabled, fast_list_response
+from fastapi.responses import StreamingResponse
+from .export import export_response
+from .stats import get_task_stats
+from .search import SearchParams, search
+from .board import BoardParams, get_board
+from .sync import sync_changes
+from .permissions import sync_role_permission_links
+from .events import iter_sse, stream_websocket
+from .google_auth import verify_google_id_token
+from .bulk import bulk_create, bulk_patch
+from .batch import run_batch
+from .rate_limit import auth_email_limit, auth_ip_limit, batch_gate, bulk_gate, search_gate
+from typing import Literal
 from sqlmodel import Session, select
-from google.oauth2 import id_token
+from .pool_metrics import get_pool_stats
 from .database import get_session
-import os
+from . import database
+import asyncio
 
 router = APIRouter()
 
 
+def task_filters(owner_id: int | None = None, task_status_id: int | None = None, due_from: date | None = None, due_to: date | None = None, active: bool = True) -> list:
+    filters = [ReadTask.task_active == active]
+    if owner_id is not None:
+        filters.append(ReadTask.owner_id == owner_id)
+    if task_status_id is not None:
+        filters.append(ReadTask.task_status_id == task_status_id)
+    if due_from is not None:
+        filters.append(ReadTask.task_due_date >= due_from)
+    if due_to is not None:
+        filters.append(ReadTask.task_due_date <= due_to)
+    return filters
+
+
+def _read_and_release(session: Session, read):
+    """Run ``read`` and close ``session``, returning its connection to the pool before the caller awaits bcrypt.
+
+    Password hashes can queue for a worker (see passwords.py); holding a connection idle in transaction
+    meanwhile would let a burst of logins drain the pool. Loaded objects stay usable, detached, and the
+    session opens a new transaction if it is used again.
+    """
+    try:
+        return read()
+    finally:
+        session.close()
+
+
 @router.get("/health")
 def health() -> dict[str, str]:
     return {"message": "Health is good"}
 
 
-router.post("/refresh-token")(refresh_token)
+@router.get("/health/db", dependencies=[Depends(verify_monitoring_access)])
+def health_db() -> dict[str, dict]:
+    pools = {"sync": get_pool_stats(database.engine.pool)}
+    if database.async_engine is not None:
+        pools["async"] = get_pool_stats(database.async_engine.sync_engine.pool)
+
+    settings = {
+        "pool_size": database.DB_POOL_SIZE,
+        "max_overflow": database.DB_MAX_OVERFLOW,
+        "pool_timeout": database.DB_POOL_TIMEOUT,
+        "pool_recycle": database.DB_POOL_RECYCLE,
+        "pool_pre_ping": database.DB_POOL_PRE_PING
+    }
+    return {"settings": settings, "pools": pools}
+
 
+router.post("/refresh-token", dependencies=[Depends(auth_ip_limit)])(refresh_token)
 
-@router.post("/login")
-def login(user: Login, response: Response, session: Session = Depends(get_session)) -> dict[str, str]:
+
+@router.post("/login", dependencies=[Depends(auth_ip_limit)])
+async def login(user: Login, response: Response, session: Session = Depends(get_session)) -> dict[str, str | list[str]]:
+    # Before any bcrypt work, so a credential stuffing burst is turned away cheaply
+    await auth_email_limit.check(user.email)
     statement = (
-        select(ReadUser, ReadRole.role_name, ReadRole.role_permissions)
+        select(ReadUser, ReadRole.role_name)
         .join(ReadRole, ReadUser.role_id == ReadRole.role_id)
         .where(ReadUser.email == user.email)
     )
 
-    result = session.exec(statement).first()
+    result = await run_in_threadpool(_read_and_release, session, lambda: session.exec(statement).first())
 
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    db_user, role_name, role_permissions = result
+    db_user, role_name = result
 
-    if not verify_password(user.plain_password, db_user.hashed_password):
+    if not await verify_password_async(user.plain_password, db_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    access_token = issue_tokens_and_set_cookie(response, db_user, role_name, role_permissions)
-    return {"access_token": access_token}
+    return await run_in_threadpool(issue_tokens_and_set_cookie, response, session, db_user, role_name)
 
 
-@router.post("/login/google")
-def login_google(payload: dict, response: Response, session: Session = Depends(get_session)) -> dict[str, str]:
+@router.post("/login/google", dependencies=[Depends(auth_ip_limit)])
+def login_google(payload: dict, response: Response, session: Session = Depends(get_session)) -> dict[str, str | list[str]]:
     token = payload.get("token")  # ID token from Google frontend
 
     if not token:
         raise HTTPException(status_code=400, detail="Google token missing")
 
     try:
-        # Verify Google ID token
-        idinfo: dict = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            os.getenv("GOOGLE_CLIENT_ID")
-        )
+        # Verify Google ID token (signing keys and verified tokens are cached, see google_auth.py)
+        idinfo: dict = verify_google_id_token(token)
 
         email = idinfo.get("email")
         first_name = idinfo.get("given_name")
         last_name = idinfo.get("family_name")
 
         # Check if user exists
-        statement = select(ReadUser, ReadRole.role_name, ReadRole.role_permissions)\
+        statement = select(ReadUser, ReadRole.role_name)\
             .join(ReadRole, ReadUser.role_id == ReadRole.role_id)\
             .where(ReadUser.email == email)
 
@@ -71,9 +128,8 @@ def login_google(payload: dict, response: Response, session: Session = Depends(g
 
         if result:
             # Existing user → login
-            db_user, role_name, role_permissions = result
-            access_token = issue_tokens_and_set_cookie(response, db_user, role_name, role_permissions)
-            return {"access_token": access_token}
+            db_user, role_name = result
+            return issue_tokens_and_set_cookie(response, session, db_user, role_name)
 
         # New user → return prefill data to frontend
         return {
@@ -87,11 +143,12 @@ def login_google(payload: dict, response: Response, session: Session = Depends(g
         raise HTTPException(status_code=400, detail=f"Google login failed: {e}")
 
 
-@router.post("/register", response_model=FilteredReadUser, status_code=status.HTTP_201_CREATED)
-def create_user(user: WriteUser, session: Session = Depends(get_session)) -> dict[str, str | int | bool | datetime]:
+@router.post("/register", response_model=FilteredReadUser, status_code=status.HTTP_201_CREATED, dependencies=[Depends(auth_ip_limit)])
+async def create_user(user: WriteUser, session: Session = Depends(get_session)) -> dict[str, str | int | bool | datetime]:
+    await auth_email_limit.check(user.email)
     filter = [ReadUser.email == user.email]
-    existing_user: ReadUser | None = read_from_db(
-        session, ReadUser, filter, True)
+    existing_user: ReadUser | None = await run_in_threadpool(
+        _read_and_release, session, lambda: read_from_db(session, ReadUser, filter, True))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -100,32 +157,32 @@ def create_user(user: WriteUser, session: Session = Depends(get_session)) -> dic
 
     data = ReadUser(
         **user.model_dump(exclude={"plain_password"}),
-        hashed_password=hash_password(user.plain_password)
+        hashed_password=await hash_password_async(user.plain_password)
     )
 
-    db_user = write_to_db(session, data)
+    db_user = await run_in_threadpool(write_to_db, session, data)
     return db_user
 
 
 @router.post("/change_password")
-def change_password(data: ChangePassword, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_taskstatus", "view_project", "view_task"])) -> dict[str, str]:
-    user = session.get(ReadUser, data.user_id)
+async def change_password(data: ChangePassword, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_taskstatus", "view_project", "view_task"])) -> dict[str, str]:
+    user = await run_in_threadpool(_read_and_release, session, lambda: session.get(ReadUser, data.user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    if not verify_password(data.old_password_plain, user.hashed_password):
+    if not await verify_password_async(data.old_password_plain, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Old password is incorrect")
 
     update_data = ReadUser(
         **data.model_dump(),
-        hashed_password=hash_password(data.new_password_plain)
+        hashed_password=await hash_password_async(data.new_password_plain)
     )
 
     update_data_json = [update_data.model_dump(
         include={"user_id", "hashed_password", "modified_by_email", "modified_on_date"})]
-    response = update_in_db(session, ReadUser, update_data_json)
+    response = await run_in_threadpool(update_in_db, session, ReadUser, update_data_json)
 
     if response:
         return {"message": "Password updated successfully."}
@@ -134,7 +191,7 @@ def change_password(data: ChangePassword, session: Session = Depends(get_session
 @router.post("/logout")
 def logout(response: Response, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=[])) -> None:
     current_time = datetime.now(timezone.utc).replace(microsecond=0)
-    update_in_db(session, ReadUser, [{"user_id": jwt_user.user_id, "refresh_token": None, "modified_by_email": "system", "modified_on_date": current_time}])
+    update_in_db(session, ReadUser, [{"user_id": jwt_user.user_id, "refresh_token": None, "modified_by_email": "system"}], current_time)
     response.delete_cookie(
         key="refresh_token",
         secure=True,
@@ -144,9 +201,16 @@ def logout(response: Response, session: Session = Depends(get_session), jwt_user
 
 
 @router.get("/users", response_model=list[FilteredReadUser])
-def get_users(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_user"])) -> list[ReadUser] | None:
-    response = read_from_db(session, ReadUser, [ReadUser.user_active == True])
-    return response
+def get_users(response: Response, role_id: int | None = None, active: bool = True, page: PageParams = Depends(), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_user"])) -> list[ReadUser] | None:
+    filters = [ReadUser.user_active == active]
+    if role_id is not None:
+        filters.append(ReadUser.role_id == role_id)
+
+    if fast_path_enabled():
+        return fast_list_response(session, response, ReadUser, FilteredReadUser, filters, page)
+
+    users = read_from_db(session, ReadUser, filters, page=page)
+    return page.finalize(response, users, ReadUser)
 
 
 @router.get("/users/{user_id}", response_model=FilteredReadUser)
@@ -174,13 +238,13 @@ def create_role(user: WriteRole, session: Session = Depends(get_session), jwt_us
     role_data = user.model_dump()
     db_user = ReadRole(**role_data)
     response = write_to_db(session, db_user)
+    sync_role_permission_links(session, [response["role_id"]])
     return response
 
 
 @router.get("/roles", response_model=list[ReadRole])
-def get_roles(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_role"])) -> list[ReadRole] | None:
-    response = read_from_db(session, ReadRole, [ReadRole.role_active == True])
-    return response
+def get_roles(request: Request, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_role"])) -> list[ReadRole] | None:
+    return reference_data_response(request, session, ReadRole, [ReadRole.role_active == True], list[ReadRole])
 
 
 @router.get("/roles/{role_id}", response_model=ReadRole)
@@ -198,15 +262,22 @@ def update_role(data: ReadRole, session: Session = Depends(get_session), jwt_use
     data_json = [d.model_dump(
         exclude={"created_by_email", "created_on_date"}) for d in data]
     response = update_in_db(session, ReadRole, data_json)
+    sync_role_permission_links(session, [d["role_id"] for d in data_json])
     return response
 
 
-@router.get("/role_permissions", response_model=list[ReadRolePermissions])
-def get_role_permissions(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_role"])) -> list[ReadRolePermissions] | None:
-    response = read_from_db(session, ReadRolePermissions)
+@router.patch("/roles")
+def patch_roles(data: list[PatchRole], session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["update_role"])) -> dict:
+    response = bulk_patch(session, ReadRole, data, jwt_user.email)
+    sync_role_permission_links(session, [row["role_id"] for row in response["rows"]])
     return response
 
 
+@router.get("/role_permissions", response_model=list[ReadRolePermissions])
+def get_role_permissions(request: Request, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_role"])) -> list[ReadRolePermissions] | None:
+    return reference_data_response(request, session, ReadRolePermissions, [], list[ReadRolePermissions])
+
+
 @router.post("/projects", response_model=ReadProject, status_code=status.HTTP_201_CREATED)
 def create_project(project: WriteProject, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["create_project"])) -> dict[str, str | int | bool | date | datetime]:
     data = ReadProject(
@@ -216,16 +287,36 @@ def create_project(project: WriteProject, session: Session = Depends(get_session
     return response
 
 
-@router.get("/projects", response_model=list[ReadProject])
-def get_projects(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project"])) -> list[ReadProject] | None:
-    response = read_from_db(session, ReadProject, [ReadProject.project_active == True])
-    return response
+@router.post("/projects/bulk", dependencies=[Depends(bulk_gate)])
+async def create_projects_bulk(request: Request, response: Response, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["create_project"])) -> dict:
+    return await bulk_create(request, response, session, WriteProject, ReadProject)
 
 
-@router.get("/projects/{project_id}", response_model=ReadProject)
-def get_project(project_id: int, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project"])) -> ReadProject | None:
-    response = read_from_db(session, ReadProject, [ReadProject.project_id == project_id], fetch_first=True)
-    return response
+@router.get("/projects", response_model=list[ExpandedReadProject], response_model_exclude_unset=True)
+def get_projects(response: Response, owner_id: int | None = None, active: bool = True, page: PageParams = Depends(), expand: list[str] = Depends(project_expand), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project"])) -> list[ReadProject] | None:
+    filters = [ReadProject.project_active == active]
+    if owner_id is not None:
+        filters.append(ReadProject.owner_id == owner_id)
+
+    if fast_path_enabled(expand):
+        return fast_list_response(session, response, ReadProject, ProjectSummary, filters, page)
+
+    projects = read_from_db(session, ReadProject, filters, page=page, options=project_expand.options(expand))
+    return expand_rows(page.finalize(response, projects, ReadProject), expand)
+
+
+@router.get("/projects/export")
+def export_projects(format: Literal["ndjson", "csv"] = "ndjson", owner_id: int | None = None, active: bool = True, jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project"])) -> StreamingResponse:
+    filters = [ReadProject.project_active == active]
+    if owner_id is not None:
+        filters.append(ReadProject.owner_id == owner_id)
+    return export_response(ReadProject, filters, format)
+
+
+@router.get("/projects/{project_id}", response_model=ExpandedReadProject, response_model_exclude_unset=True)
+def get_project(project_id: int, expand: list[str] = Depends(project_expand), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project"])) -> ReadProject | None:
+    response = read_from_db(session, ReadProject, [ReadProject.project_id == project_id], fetch_first=True, options=project_expand.options(expand))
+    return expand_rows(response, expand)
 
 
 @router.post("/update_project")
@@ -239,10 +330,72 @@ def update_project(data: ReadProject, session: Session = Depends(get_session), j
     return response
 
 
-@router.get("/projects/{project_id}/tasks", response_model=list[ReadTask])
-def get_tasks_by_project_id(project_id: int, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> list[ReadTask] | None:
-    response = read_from_db(session, ReadTask, [ReadTask.task_active == True, ReadTask.project_id == project_id])
-    return response
+@router.patch("/projects", dependencies=[Depends(bulk_gate)])
+def patch_projects(data: list[PatchProject], session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["update_project"])) -> dict:
+    return bulk_patch(session, ReadProject, data, jwt_user.email)
+
+
+@router.get("/projects/{project_id}/stats")
+def get_project_stats(project_id: int, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> dict:
+    return get_task_stats(session, project_id)
+
+
+@router.get("/projects/{project_id}/tasks", response_model=list[ExpandedReadTask], response_model_exclude_unset=True)
+def get_tasks_by_project_id(project_id: int, response: Response, filters: list = Depends(task_filters), page: PageParams = Depends(), expand: list[str] = Depends(task_expand), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> list[ReadTask] | None:
+    if fast_path_enabled(expand):
+        return fast_list_response(session, response, ReadTask, TaskSummary, [*filters, ReadTask.project_id == project_id], page)
+    tasks = read_from_db(session, ReadTask, [*filters, ReadTask.project_id == project_id], page=page, options=task_expand.options(expand))
+    return expand_rows(page.finalize(response, tasks, ReadTask), expand)
+
+
+@router.get("/projects/{project_id}/board", response_model=Board)
+def get_project_board(project_id: int, filters: list = Depends(task_filters), params: BoardParams = Depends(), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> dict:
+    return get_board(session, project_id, filters, params)
+
+
+@router.get("/stats")
+def get_stats(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> dict:
+    return get_task_stats(session)
+
+
+@router.get("/search", response_model=list[SearchResult], dependencies=[Depends(search_gate)])
+def search_tasks_and_projects(response: Response, params: SearchParams = Depends(), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> list[SearchResult]:
+    return params.finalize(response, search(session, params))
+
+
+@router.get("/sync")
+def get_sync_changes(since: str | None = Query(None, description="cursor returned by the previous sync"), limit: int = Query(500, ge=1, le=5000), entities: str | None = Query(None, description="Comma separated subset of tasks,projects,task_statuses,users; by default all the token can view"), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=[])) -> dict:
+    return sync_changes(session, jwt_user, since, limit, entities)
+
+
+@router.post("/batch", dependencies=[Depends(batch_gate)])
+async def batch(operations: list[BatchOperation], request: Request, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=[])) -> Response:
+    # Each operation is authorized against its own route's scopes, see batch.py
+    return await run_batch(request, session, jwt_user, operations)
+
+
+@router.get("/events")
+async def task_events(project_id: list[int] = Query([]), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_project", "view_task"])) -> StreamingResponse:
+    return StreamingResponse(iter_sse(project_id), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.websocket("/ws/events")
+async def task_events_websocket(websocket: WebSocket, project_id: list[int] = Query([])) -> None:
+    await websocket.accept()
+    try:
+        authorization = websocket.headers.get("authorization")
+        if not authorization:
+            # Browsers cannot set headers on WebSocket requests, so the token may come as the first message
+            message = await asyncio.wait_for(websocket.receive_json(), timeout=10)
+            authorization = f"Bearer {message.get('token', '')}" if isinstance(message, dict) else ""
+        await run_in_threadpool(authenticate_access_token, authorization, ["view_project", "view_task"])
+    except WebSocketDisconnect:
+        return
+    except (HTTPException, asyncio.TimeoutError, ValueError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await stream_websocket(websocket, project_id)
 
 
 @router.post("/tasks", response_model=ReadTask, status_code=status.HTTP_201_CREATED)
@@ -254,16 +407,30 @@ def create_task(task: WriteTask, session: Session = Depends(get_session), jwt_us
     return response
 
 
-@router.get("/tasks", response_model=list[ReadTask])
-def get_tasks(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> list[ReadTask] | None:
-    response = read_from_db(session, ReadTask, [ReadTask.task_active == True])
-    return response
+@router.post("/tasks/bulk", dependencies=[Depends(bulk_gate)])
+async def create_tasks_bulk(request: Request, response: Response, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["create_task"])) -> dict:
+    return await bulk_create(request, response, session, WriteTask, ReadTask)
 
 
-@router.get("/tasks/{task_id}", response_model=ReadTask)
-def get_task(task_id: int, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> ReadTask | None:
-    response = read_from_db(session, ReadTask, [ReadTask.task_id == task_id], fetch_first=True)
-    return response
+@router.get("/tasks", response_model=list[ExpandedReadTask], response_model_exclude_unset=True)
+def get_tasks(response: Response, filters: list = Depends(task_filters), page: PageParams = Depends(), expand: list[str] = Depends(task_expand), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> list[ReadTask] | None:
+    if fast_path_enabled(expand):
+        return fast_list_response(session, response, ReadTask, TaskSummary, filters, page)
+    tasks = read_from_db(session, ReadTask, filters, page=page, options=task_expand.options(expand))
+    return expand_rows(page.finalize(response, tasks, ReadTask), expand)
+
+
+@router.get("/tasks/export")
+def export_tasks(format: Literal["ndjson", "csv"] = "ndjson", project_id: int | None = None, filters: list = Depends(task_filters), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> StreamingResponse:
+    if project_id is not None:
+        filters = [*filters, ReadTask.project_id == project_id]
+    return export_response(ReadTask, filters, format)
+
+
+@router.get("/tasks/{task_id}", response_model=ExpandedReadTask, response_model_exclude_unset=True)
+def get_task(task_id: int, expand: list[str] = Depends(task_expand), session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_task"])) -> ReadTask | None:
+    response = read_from_db(session, ReadTask, [ReadTask.task_id == task_id], fetch_first=True, options=task_expand.options(expand))
+    return expand_rows(response, expand)
 
 
 @router.post("/update_task")
@@ -277,6 +444,11 @@ def update_task(data: ReadTask, session: Session = Depends(get_session), jwt_use
     return response
 
 
+@router.patch("/tasks", dependencies=[Depends(bulk_gate)])
+def patch_tasks(data: list[PatchTask], session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["update_task"])) -> dict:
+    return bulk_patch(session, ReadTask, data, jwt_user.email)
+
+
 @router.post("/update_taskstatus_in_task")
 def update_task(data: ReadTask, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["update_taskstatus_in_task", "update_task"])) -> dict[str, str]:
     if isinstance(data, ReadTask):
@@ -298,9 +470,8 @@ def create_taskstatus(task: WriteTaskStatus, session: Session = Depends(get_sess
 
 
 @router.get("/taskstatus", response_model=list[ReadTaskStatus])
-def get_taskstatuses(session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_taskstatus"])) -> list[ReadTaskStatus] | None:
-    response = read_from_db(session, ReadTaskStatus, [ReadTaskStatus.task_status_active == True])
-    return response
+def get_taskstatuses(request: Request, session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["view_taskstatus"])) -> list[ReadTaskStatus] | None:
+    return reference_data_response(request, session, ReadTaskStatus, [ReadTaskStatus.task_status_active == True], list[ReadTaskStatus])
 
 
 @router.get("/taskstatus/{task_status_id}", response_model=ReadTaskStatus)
@@ -318,3 +489,8 @@ def update_taskstatus(data: ReadTaskStatus, session: Session = Depends(get_sessi
         exclude={"created_by_email", "created_on_date"}) for d in data]
     response = update_in_db(session, ReadTaskStatus, data_json)
     return response
+
+
+@router.patch("/taskstatus")
+def patch_taskstatus(data: list[PatchTaskStatus], session: Session = Depends(get_session), jwt_user: JWTPayloadBase = Security(verify_access_token, scopes=["update_taskstatus"])) -> dict:
+    return bulk_patch(session, ReadTaskStatus, data, jwt_user.email)
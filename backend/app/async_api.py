@@ -0,0 +1,145 @@
+from .models import ReadProject, ReadRole, ReadRolePermissions, ReadTask, ReadTaskStatus, ReadUser, FilteredReadUser, ExpandedReadProject, ExpandedReadTask, ProjectSummary, TaskSummary, WriteProject, WriteTask, JWTPayloadBase
+from .utils import async_write_to_db, async_read_from_db, async_update_in_db, verify_access_token_async
+from fastapi import APIRouter, Depends, status, HTTPException, Request, Response, Security
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import date, datetime
+from .database import get_async_session
+from .expand import task_expand, project_expand, expand_rows
+from .conditional import async_reference_data_response
+from .pagination import PageParams
+from .fast_json import fast_path_enabled, async_fast_list_response
+from .api import task_filters
+
+# Async (asyncpg) versions of the hot read and task write routes. main.py mounts this router in
+# front of api.router when DB_ASYNC_MODE is enabled, so any route not ported here is still served
+# by its sync counterpart (path ids use the :int convertor so e.g. /tasks/export is not captured).
+router = APIRouter()
+
+
+@router.get("/users", response_model=list[FilteredReadUser])
+async def get_users(response: Response, role_id: int | None = None, active: bool = True, page: PageParams = Depends(), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_user"])) -> list[ReadUser] | None:
+    filters = [ReadUser.user_active == active]
+    if role_id is not None:
+        filters.append(ReadUser.role_id == role_id)
+
+    if fast_path_enabled():
+        return await async_fast_list_response(session, response, ReadUser, FilteredReadUser, filters, page)
+
+    users = await async_read_from_db(session, ReadUser, filters, page=page)
+    return page.finalize(response, users, ReadUser)
+
+
+@router.get("/users/{user_id:int}", response_model=FilteredReadUser)
+async def get_user(user_id: int, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_user"])) -> ReadUser | None:
+    user = await async_read_from_db(session, ReadUser, [ReadUser.user_id == user_id], fetch_first=True)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
+@router.get("/roles", response_model=list[ReadRole])
+async def get_roles(request: Request, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_role"])) -> list[ReadRole] | None:
+    return await async_reference_data_response(request, session, ReadRole, [ReadRole.role_active == True], list[ReadRole])
+
+
+@router.get("/roles/{role_id:int}", response_model=ReadRole)
+async def get_role(role_id: int, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_role"])) -> ReadRole | None:
+    response = await async_read_from_db(session, ReadRole, [ReadRole.role_id == role_id], fetch_first=True)
+    return response
+
+
+@router.get("/role_permissions", response_model=list[ReadRolePermissions])
+async def get_role_permissions(request: Request, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_role"])) -> list[ReadRolePermissions] | None:
+    return await async_reference_data_response(request, session, ReadRolePermissions, [], list[ReadRolePermissions])
+
+
+@router.post("/projects", response_model=ReadProject, status_code=status.HTTP_201_CREATED)
+async def create_project(project: WriteProject, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["create_project"])) -> dict[str, str | int | bool | date | datetime]:
+    data = ReadProject(
+        **project.model_dump()
+    )
+    response = await async_write_to_db(session, data)
+    return response
+
+
+@router.get("/projects", response_model=list[ExpandedReadProject], response_model_exclude_unset=True)
+async def get_projects(response: Response, owner_id: int | None = None, active: bool = True, page: PageParams = Depends(), expand: list[str] = Depends(project_expand), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_project"])) -> list[ReadProject] | None:
+    filters = [ReadProject.project_active == active]
+    if owner_id is not None:
+        filters.append(ReadProject.owner_id == owner_id)
+
+    if fast_path_enabled(expand):
+        return await async_fast_list_response(session, response, ReadProject, ProjectSummary, filters, page)
+
+    projects = await async_read_from_db(session, ReadProject, filters, page=page, options=project_expand.options(expand))
+    return expand_rows(page.finalize(response, projects, ReadProject), expand)
+
+
+@router.get("/projects/{project_id:int}", response_model=ExpandedReadProject, response_model_exclude_unset=True)
+async def get_project(project_id: int, expand: list[str] = Depends(project_expand), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_project"])) -> ReadProject | None:
+    response = await async_read_from_db(session, ReadProject, [ReadProject.project_id == project_id], fetch_first=True, options=project_expand.options(expand))
+    return expand_rows(response, expand)
+
+
+@router.get("/projects/{project_id:int}/tasks", response_model=list[ExpandedReadTask], response_model_exclude_unset=True)
+async def get_tasks_by_project_id(project_id: int, response: Response, filters: list = Depends(task_filters), page: PageParams = Depends(), expand: list[str] = Depends(task_expand), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_project", "view_task"])) -> list[ReadTask] | None:
+    if fast_path_enabled(expand):
+        return await async_fast_list_response(session, response, ReadTask, TaskSummary, [*filters, ReadTask.project_id == project_id], page)
+    tasks = await async_read_from_db(session, ReadTask, [*filters, ReadTask.project_id == project_id], page=page, options=task_expand.options(expand))
+    return expand_rows(page.finalize(response, tasks, ReadTask), expand)
+
+
+@router.post("/tasks", response_model=ReadTask, status_code=status.HTTP_201_CREATED)
+async def create_task(task: WriteTask, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["create_task"])) -> dict[str, str | int | bool | date | datetime]:
+    data = ReadTask(
+        **task.model_dump()
+    )
+    response = await async_write_to_db(session, data)
+    return response
+
+
+@router.get("/tasks", response_model=list[ExpandedReadTask], response_model_exclude_unset=True)
+async def get_tasks(response: Response, filters: list = Depends(task_filters), page: PageParams = Depends(), expand: list[str] = Depends(task_expand), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_task"])) -> list[ReadTask] | None:
+    if fast_path_enabled(expand):
+        return await async_fast_list_response(session, response, ReadTask, TaskSummary, filters, page)
+    tasks = await async_read_from_db(session, ReadTask, filters, page=page, options=task_expand.options(expand))
+    return expand_rows(page.finalize(response, tasks, ReadTask), expand)
+
+
+@router.get("/tasks/{task_id:int}", response_model=ExpandedReadTask, response_model_exclude_unset=True)
+async def get_task(task_id: int, expand: list[str] = Depends(task_expand), session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_task"])) -> ReadTask | None:
+    response = await async_read_from_db(session, ReadTask, [ReadTask.task_id == task_id], fetch_first=True, options=task_expand.options(expand))
+    return expand_rows(response, expand)
+
+
+@router.post("/update_task")
+async def update_task(data: ReadTask, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["update_task"])) -> dict[str, str]:
+    if isinstance(data, ReadTask):
+        data: list[ReadTask] = [data]
+
+    data_json = [d.model_dump(
+        exclude={"created_by_email", "created_on_date"}) for d in data]
+    response = await async_update_in_db(session, ReadTask, data_json)
+    return response
+
+
+@router.post("/update_taskstatus_in_task")
+async def update_taskstatus_in_task(data: ReadTask, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["update_taskstatus_in_task", "update_task"])) -> dict[str, str]:
+    if isinstance(data, ReadTask):
+        data: list[ReadTask] = [data]
+
+    data_json = [d.model_dump(
+        include={"task_id", "task_status_id", "modified_by_email", "modified_on_date"}) for d in data]
+    response = await async_update_in_db(session, ReadTask, data_json)
+    return response
+
+
+@router.get("/taskstatus", response_model=list[ReadTaskStatus])
+async def get_taskstatuses(request: Request, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_taskstatus"])) -> list[ReadTaskStatus] | None:
+    return await async_reference_data_response(request, session, ReadTaskStatus, [ReadTaskStatus.task_status_active == True], list[ReadTaskStatus])
+
+
+@router.get("/taskstatus/{task_status_id:int}", response_model=ReadTaskStatus)
+async def get_taskstatus(task_status_id: int, session: AsyncSession = Depends(get_async_session), jwt_user: JWTPayloadBase = Security(verify_access_token_async, scopes=["view_taskstatus"])) -> ReadTaskStatus | None:
+    response = await async_read_from_db(session, ReadTaskStatus, [ReadTaskStatus.task_status_id == task_status_id], fetch_first=True)
+    return response
@@ -0,0 +1,196 @@
+from fastapi import HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute, get_request_handler
+from fastapi.security import SecurityScopes
+from starlette.routing import Match
+import fastapi
+from .database import DEFER_COMMIT, DEFERRED_INVALIDATIONS, get_async_session, get_session
+from .models import BatchOperation, JWTPayloadBase
+from .utils import check_scopes, invalidate_caches, verify_access_token
+from sqlmodel import Session
+from types import SimpleNamespace
+from os import getenv
+import logging
+import inspect
+import json
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_OPERATIONS = int(getenv("BATCH_MAX_OPERATIONS") or 50)
+
+# Headers of the batch request not passed on to its operations; each gets its own JSON body
+_REQUEST_ONLY_HEADERS = (b"content-length", b"content-type", b"transfer-encoding")
+
+
+def _check_fastapi_compatibility() -> None:
+    """_handler rebuilds route handlers from FastAPI internals: the private ``APIRoute._embed_body_fields``
+    and ``get_request_handler``'s ``embed_body_fields`` argument. Fail at import, not on the first batch,
+    if an upgrade moved either."""
+    probe = APIRoute("/", lambda: None)
+    if not hasattr(probe, "_embed_body_fields") or "embed_body_fields" not in inspect.signature(get_request_handler).parameters:
+        raise RuntimeError(f"app.batch does not support FastAPI {fastapi.__version__}; update _handler for its route handler internals")
+
+
+_check_fastapi_compatibility()
+
+
+def _dependency_calls(dependant):
+    for sub_dependant in dependant.dependencies:
+        yield sub_dependant.call
+        yield from _dependency_calls(sub_dependant)
+
+
+def _batchable(route: APIRoute) -> bool:
+    """Authenticated routes that return a plain response.
+
+    Streams and unauthenticated routes (login, register, refresh-token) have no place in a batch.
+    """
+    returns = inspect.signature(route.endpoint).return_annotation
+    streams = inspect.isclass(returns) and issubclass(returns, StreamingResponse)
+    return verify_access_token in set(_dependency_calls(route.dependant)) and not streams
+
+
+def _resolve(request: Request, operation: BatchOperation) -> tuple[APIRoute | None, dict, int]:
+    # Operation paths are relative to where /batch is mounted, like the client's other calls
+    base = request.scope["path"].removesuffix("/batch")
+    path, _, query = operation.path.partition("?")
+    headers = [(name, value) for name, value in request.scope["headers"] if name not in _REQUEST_ONLY_HEADERS]
+    scope = {
+        **request.scope,
+        "method": operation.method,
+        "path": base + path,
+        "raw_path": (base + path).encode(),
+        "query_string": query.encode(),
+        "headers": [*headers, (b"content-type", b"application/json")],
+    }
+
+    found = status.HTTP_404_NOT_FOUND
+    for route in request.app.router.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.PARTIAL:
+            found = status.HTTP_405_METHOD_NOT_ALLOWED
+        elif match == Match.FULL:
+            if get_async_session in set(_dependency_calls(route.dependant)):
+                # Cannot share the batch's transaction; with DB_ASYNC_MODE the sync route for the path follows
+                continue
+            if route.endpoint is request.scope["endpoint"] or not _batchable(route):
+                return None, scope, status.HTTP_400_BAD_REQUEST
+            return route, {**scope, **child_scope}, status.HTTP_200_OK
+    return None, scope, found
+
+
+def _handler(route: APIRoute, overrides: SimpleNamespace):
+    # What route.get_route_handler() builds, but resolving dependencies against the batch's overrides
+    return get_request_handler(
+        dependant=route.dependant,
+        body_field=route.body_field,
+        status_code=route.status_code,
+        response_class=route.response_class,
+        response_field=route.secure_cloned_response_field,
+        response_model_include=route.response_model_include,
+        response_model_exclude=route.response_model_exclude,
+        response_model_by_alias=route.response_model_by_alias,
+        response_model_exclude_unset=route.response_model_exclude_unset,
+        response_model_exclude_defaults=route.response_model_exclude_defaults,
+        response_model_exclude_none=route.response_model_exclude_none,
+        dependency_overrides_provider=overrides,
+        embed_body_fields=route._embed_body_fields,
+    )
+
+
+def _encode_result(index: int, response_status: int, headers: dict, body: bytes | None, media_type: str | None) -> bytes:
+    envelope = json.dumps({"index": index, "status": response_status, "headers": headers}).encode()
+    if not body:
+        body = b"null"
+    elif media_type != "application/json":
+        body = json.dumps(body.decode()).encode()
+    # JSON bodies are spliced in as produced by the route instead of being parsed and encoded again
+    return envelope[:-1] + b', "body": ' + body + b"}"
+
+
+def _error_result(index: int, response_status: int, detail, headers: dict | None = None) -> bytes:
+    return _encode_result(index, response_status, headers or {}, json.dumps({"detail": jsonable_encoder(detail)}).encode(), "application/json")
+
+
+async def run_batch(request: Request, session: Session, jwt_user: JWTPayloadBase, operations: list[BatchOperation]) -> Response:
+    """Run ``operations`` in order through their routes, in one session and one transaction.
+
+    The access token is verified once for the batch; each operation still needs its route's scopes.
+    Writes are flushed, not committed, so later operations read earlier ones. The first operation
+    answering 4xx/5xx rolls everything back and the rest are reported as 424 without running;
+    otherwise the batch commits once. Results keep each route's status code, headers and body.
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batches are limited to {BATCH_MAX_OPERATIONS} operations."
+        )
+
+    def batch_user(required_scopes: SecurityScopes) -> JWTPayloadBase:
+        check_scopes(required_scopes.scopes, jwt_user.permission_mask, jwt_user.permission_version)
+        return jwt_user
+
+    overrides = SimpleNamespace(dependency_overrides={
+        **request.app.dependency_overrides,
+        get_session: lambda: session,
+        verify_access_token: batch_user,
+    })
+
+    results, failed = [], None
+    session.info[DEFER_COMMIT] = True
+    try:
+        for index, operation in enumerate(operations):
+            if failed is not None:
+                results.append(_error_result(index, status.HTTP_424_FAILED_DEPENDENCY, f"Not run: operation {failed} failed"))
+                continue
+
+            route, scope, found = _resolve(request, operation)
+            if route is None:
+                detail = {404: "Not Found", 405: "Method Not Allowed"}.get(found, f"{operation.path} cannot be batched")
+                results.append(_error_result(index, found, detail))
+                failed = index
+                continue
+
+            body = json.dumps(jsonable_encoder(operation.body)).encode() if operation.body is not None else b""
+
+            async def receive(body=body) -> dict:
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            try:
+                response = await _handler(route, overrides)(Request(scope, receive))
+            except HTTPException as e:
+                results.append(_error_result(index, e.status_code, e.detail, e.headers))
+                failed = index
+                continue
+            except RequestValidationError as e:
+                results.append(_error_result(index, status.HTTP_422_UNPROCESSABLE_ENTITY, e.errors()))
+                failed = index
+                continue
+            except Exception:
+                # What would have been a 500 on its own; the batch still answers for the other operations
+                logger.exception("Batch operation %s %s failed", operation.method, operation.path)
+                results.append(_error_result(index, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error"))
+                failed = index
+                continue
+
+            headers = {name: value for name, value in response.headers.items() if name not in ("content-length", "content-type")}
+            results.append(_encode_result(index, response.status_code, headers, response.body, response.media_type))
+            if response.status_code >= 400:
+                failed = index
+
+        if failed is None:
+            await run_in_threadpool(session.commit)
+        else:
+            await run_in_threadpool(session.rollback)
+    finally:
+        session.info.pop(DEFER_COMMIT, None)
+        for obj, data in session.info.pop(DEFERRED_INVALIDATIONS, []):
+            invalidate_caches(obj, data)
+
+    content = b'{"committed": %s, "results": [%s]}' % (b"true" if failed is None else b"false", b", ".join(results))
+    return Response(content, media_type="application/json")
@@ -0,0 +1,91 @@
+from .models import ReadTask, ReadTaskStatus, TaskSummary
+from .pagination import PageParams, encode_cursor
+from fastapi import HTTPException, Query, status
+from sqlmodel import Session, func, or_, select
+from typing import Literal
+
+BOARD_DEFAULT_LIMIT = 20
+BOARD_MAX_LIMIT = 200
+
+
+class BoardParams:
+    """Per-column limit and ordering for the project board.
+
+    ``cursor`` continues one column, so it needs ``task_status_id``. A column's ``next_cursor``
+    works here and on ``/projects/{id}/tasks?task_status_id=`` with the same sort and order.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(BOARD_DEFAULT_LIMIT, ge=1, le=BOARD_MAX_LIMIT, description="Tasks per column"),
+        cursor: str | None = Query(None),
+        task_status_id: int | None = Query(None),
+        sort: Literal["id", "modified_on_date"] = Query("id"),
+        order: Literal["asc", "desc"] = Query("asc")
+    ):
+        if cursor and task_status_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor requires task_status_id")
+        self.limit = limit
+        self.task_status_id = task_status_id
+        self.page = PageParams(limit=limit, cursor=cursor, sort=sort, order=order)
+
+
+def _board_statement(project_id: int, filters: list, params: BoardParams):
+    page = params.page
+    sort_col, pk_col = page.columns(ReadTask)
+    columns = [ReadTask.__table__.columns[name] for name in TaskSummary.model_fields]
+
+    # Totals are counted over the whole column, positions only over rows past the cursor
+    counted = (
+        select(*columns, func.count().over(partition_by=ReadTask.task_status_id).label("total"))
+        .where(*filters, ReadTask.project_id == project_id)
+        .subquery()
+    )
+    keys = [counted.c[sort_col.name]] if sort_col is pk_col else [counted.c[sort_col.name], counted.c[pk_col.name]]
+    position = func.row_number().over(partition_by=counted.c.task_status_id, order_by=page.ordering(keys))
+
+    ranked = select(counted, position.label("position"))
+    if page.cursor:
+        ranked = ranked.where(page.after_cursor(keys, sort_col))
+    ranked = ranked.subquery()
+
+    # One row past the limit tells whether a column has more, like PageParams
+    return (
+        select(ranked)
+        .where(ranked.c.position <= params.limit + 1)
+        .order_by(ranked.c.task_status_id, ranked.c.position)
+    )
+
+
+def get_board(session: Session, project_id: int, filters: list, params: BoardParams) -> dict:
+    """A project's tasks grouped into status columns, the first ``limit`` of each, from one query."""
+    sort_name = params.page.columns(ReadTask)[0].name
+    fields = list(TaskSummary.model_fields)
+
+    grouped: dict[int, dict] = {}
+    for row in session.execute(_board_statement(project_id, filters, params)):
+        column = grouped.setdefault(row.task_status_id, {"total": row.total, "rows": []})
+        column["rows"].append(row)
+
+    # Every active status gets a column, even when empty; inactive ones only while they still hold tasks
+    statuses = select(ReadTaskStatus.task_status_id, ReadTaskStatus.task_status_name).order_by(ReadTaskStatus.task_status_id)
+    if params.task_status_id is not None:
+        statuses = statuses.where(ReadTaskStatus.task_status_id == params.task_status_id)
+    else:
+        statuses = statuses.where(or_(ReadTaskStatus.task_status_active == True, ReadTaskStatus.task_status_id.in_(list(grouped))))
+
+    board_columns = []
+    for task_status_id, task_status_name in session.exec(statuses).all():
+        column = grouped.get(task_status_id, {"total": 0, "rows": []})
+        rows, next_cursor = column["rows"], None
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            next_cursor = encode_cursor(getattr(rows[-1], sort_name), rows[-1].task_id)
+        board_columns.append({
+            "task_status_id": task_status_id,
+            "task_status_name": task_status_name,
+            "total": column["total"],
+            "tasks": [{name: getattr(row, name) for name in fields} for row in rows],
+            "next_cursor": next_cursor,
+        })
+    return {"project_id": project_id, "columns": board_columns}
@@ -0,0 +1,144 @@
+from fastapi import HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from typing import AsyncIterator, Any
+from pydantic import ValidationError
+from .utils import bulk_write_to_db, patch_in_db
+from sqlmodel import Session, SQLModel
+from os import getenv
+import json
+
+# Rows validated and inserted per INSERT ... RETURNING statement (and per commit)
+BULK_BATCH_SIZE = int(getenv("BULK_BATCH_SIZE") or 1000)
+BULK_MAX_ROWS = int(getenv("BULK_MAX_ROWS") or 100000)
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_bulk_rows(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """Yield ``(index, row)`` from a JSON array body or, for NDJSON, one row per line as it streams in."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        index, buffer = 0, b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _parse_ndjson_line(line)
+                    index += 1
+        if buffer.strip():
+            yield index, _parse_ndjson_line(buffer)
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body must be a JSON array or NDJSON")
+
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body must be a JSON array or NDJSON")
+    if len(rows) > BULK_MAX_ROWS:
+        # The whole array is already here, so it is refused before anything is saved
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests are limited to {BULK_MAX_ROWS} rows."
+        )
+
+    for index, row in enumerate(rows):
+        yield index, row
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        # Reported as a per-row error by bulk_create
+        return _InvalidLine(str(e))
+
+
+class _InvalidLine:
+    def __init__(self, error: str):
+        self.error = error
+
+
+async def bulk_create(request: Request, response: Response, session: Session, write_model: type[SQLModel], table_model: type[SQLModel]) -> dict:
+    """Validate and insert streamed rows ``BULK_BATCH_SIZE`` at a time, committing each batch.
+
+    A JSON array over ``BULK_MAX_ROWS`` is refused with 413 and nothing saved. An NDJSON stream
+    stops being read there instead; its earlier batches are already committed, so it answers 207
+    with status "truncated", the saved rows and ``unprocessed_from``, the first row left out.
+    """
+    inserted, errors, batch = [], [], []
+    total, unprocessed_from = 0, None
+
+    async for index, row in iter_bulk_rows(request):
+        if total >= BULK_MAX_ROWS:
+            unprocessed_from = index
+            break
+        total += 1
+
+        if isinstance(row, _InvalidLine):
+            errors.append({"index": index, "error": f"Invalid JSON: {row.error}"})
+            continue
+
+        try:
+            batch.append((index, write_model.model_validate(row).model_dump()))
+        except ValidationError as e:
+            errors.append({"index": index, "error": json.loads(e.json(include_url=False))})
+
+        if len(batch) >= BULK_BATCH_SIZE:
+            batch_inserted, batch_errors = await run_in_threadpool(bulk_write_to_db, session, table_model, batch)
+            inserted += batch_inserted
+            errors += batch_errors
+            batch = []
+
+    if batch:
+        batch_inserted, batch_errors = await run_in_threadpool(bulk_write_to_db, session, table_model, batch)
+        inserted += batch_inserted
+        errors += batch_errors
+
+    errors.sort(key=lambda e: e["index"])
+    result = {
+        "status": "success" if not errors else "partial",
+        "received": total,
+        "inserted": len(inserted),
+        "failed": len(errors),
+        "rows": inserted,
+        "errors": errors
+    }
+    if unprocessed_from is not None:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+        result.update(
+            status="truncated",
+            unprocessed_from=unprocessed_from,
+            detail=f"Bulk requests are limited to {BULK_MAX_ROWS} rows; rows from index {unprocessed_from} were not processed."
+        )
+    return result
+
+
+def bulk_patch(session: Session, table_model: type[SQLModel], patches: list[SQLModel], modified_by_email: str) -> dict:
+    if len(patches) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests are limited to {BULK_MAX_ROWS} rows."
+        )
+
+    # Unset and null fields are left untouched; none of the patchable columns are nullable
+    rows = [(index, patch.model_dump(exclude_none=True)) for index, patch in enumerate(patches)]
+    updated, conflicts = [], []
+    for start in range(0, len(rows), BULK_BATCH_SIZE):
+        batch_updated, batch_conflicts = patch_in_db(session, table_model, rows[start:start + BULK_BATCH_SIZE], modified_by_email)
+        updated += batch_updated
+        conflicts += batch_conflicts
+
+    updated.sort(key=lambda r: r["index"])
+    conflicts.sort(key=lambda c: c["index"])
+    return {
+        "status": "success" if not conflicts else "partial",
+        "received": len(rows),
+        "updated": len(updated),
+        "failed": len(conflicts),
+        "rows": updated,
+        "conflicts": conflicts
+    }
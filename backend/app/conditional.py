@@ -0,0 +1,126 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import Session, SQLModel, func, select
+from fastapi import Request, Response, status
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from pydantic import TypeAdapter
+from .cache import TTLCache
+from os import getenv
+import hashlib
+
+# Serialized reference-data payloads (roles, task statuses) with their validators. The table's version
+# is read on every request and a body is only served while it matches, so writes from any worker show at once.
+reference_cache = TTLCache(maxsize=64, ttl=float(getenv("REFERENCE_CACHE_TTL_SECONDS") or 60))
+
+_adapters: dict[type, TypeAdapter] = {}
+
+
+class _Entry:
+    def __init__(self, etag: str, last_modified: datetime | None, body: bytes | None = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+
+def _version_statement(obj: type[SQLModel]):
+    # Versioned over the whole table so (de)activating a row also changes the ETag
+    if "modified_on_date" in obj.__table__.columns:
+        return select(func.count(), func.max(obj.__table__.c.modified_on_date))
+    return None
+
+
+def _version_entry(obj: type[SQLModel], count: int, last_modified: datetime | None) -> _Entry:
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Microseconds, so two writes within the same second still change the ETag
+    stamp = round(last_modified.timestamp() * 1_000_000) if last_modified else 0
+    return _Entry(f'W/"{obj.__tablename__}-{count}-{stamp}"', last_modified)
+
+
+def _serialize(obj: type[SQLModel], response_model, rows: list) -> bytes:
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    return adapter.dump_json(rows)
+
+
+def _finish(obj: type[SQLModel], entry: _Entry, body: bytes) -> _Entry:
+    entry.body = body
+    if entry.etag is None:
+        # Tables without modified_on_date are versioned by their content instead, read on every request
+        entry.etag = f'"{obj.__tablename__}-{hashlib.sha1(body).hexdigest()[:16]}"'
+    return entry
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _headers(entry: _Entry) -> dict[str, str]:
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if entry.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(entry.last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _respond(request: Request, entry: _Entry) -> Response:
+    if _if_none_match(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(entry))
+    return Response(content=entry.body, media_type="application/json", headers=_headers(entry))
+
+
+def _cached(key: tuple, entry: _Entry) -> _Entry | None:
+    cached = reference_cache.get(key)
+    return cached if cached is not None and cached.etag == entry.etag else None
+
+
+def reference_data_response(request: Request, session: Session, obj: type[SQLModel], filters: list, response_model) -> Response:
+    """Serve a rarely-changing list with ETag/Last-Modified, answering If-None-Match with 304.
+
+    Only the count/max version query runs while the client's copy or the cached body is current.
+    """
+    key = (obj.__tablename__, response_model)
+    version = _version_statement(obj)
+    if version is not None:
+        entry = _version_entry(obj, *session.exec(version).one())
+        if _if_none_match(request, entry.etag):
+            return _respond(request, entry)
+        cached = _cached(key, entry)
+        if cached is not None:
+            return _respond(request, cached)
+    else:
+        entry = _Entry(None, None)
+
+    rows = session.exec(select(obj).where(*filters)).all()
+    entry = _finish(obj, entry, _serialize(obj, response_model, rows))
+    if version is not None:
+        reference_cache.set(key, entry)
+    return _respond(request, entry)
+
+
+async def async_reference_data_response(request: Request, session: AsyncSession, obj: type[SQLModel], filters: list, response_model) -> Response:
+    key = (obj.__tablename__, response_model)
+    version = _version_statement(obj)
+    if version is not None:
+        entry = _version_entry(obj, *(await session.exec(version)).one())
+        if _if_none_match(request, entry.etag):
+            return _respond(request, entry)
+        cached = _cached(key, entry)
+        if cached is not None:
+            return _respond(request, cached)
+    else:
+        entry = _Entry(None, None)
+
+    rows = (await session.exec(select(obj).where(*filters))).all()
+    entry = _finish(obj, entry, _serialize(obj, response_model, rows))
+    if version is not None:
+        reference_cache.set(key, entry)
+    return _respond(request, entry)
+
+
+def invalidate_reference_data() -> None:
+    reference_cache.clear()
@@ -1,11 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import AsyncGenerator, Generator
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from .pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_pool_events
 from .logging_config import logger
 from fastapi import HTTPException
 from dotenv import load_dotenv
-from typing import Generator
 from sqlmodel import Session
+from threading import Lock
 import os
 
 # Load environment variables from .env file
@@ -19,20 +23,39 @@ DB_PORT = os.getenv("DB_PORT")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# Connection pool settings, sized per deployment (defaults match SQLAlchemy's QueuePool defaults)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
+# Pre-ping costs a round-trip per checkout; with it off, pool_recycle alone retires stale connections
+DB_POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() == "true"
+
+# Serve the ported routes from async_api with asyncpg instead of the sync psycopg2 routes
+DB_ASYNC_MODE = os.getenv("DB_ASYNC_MODE", "false").lower() == "true"
+
 
 def get_db_connection_string() -> str:
     db_conn_str = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?options=-csearch_path%3D{DB_SCHEMA}"
     return db_conn_str
 
 
-def get_db_engine(pool_size: int = None, max_overflow: int = None) -> Engine:
+def get_db_engine(pool_size: int = None, max_overflow: int = None, pool_timeout: float = None, pool_recycle: int = None, pool_pre_ping: bool = None) -> Engine:
     try:
         db_conn_str = get_db_connection_string()
 
-        if pool_size is None and max_overflow is None:
-            engine = create_engine(db_conn_str, pool_pre_ping=True, echo=False, future=True)
-        else:
-            engine = create_engine(db_conn_str, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True, echo=False, future=True)
+        engine = create_engine(
+            db_conn_str,
+            poolclass=InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+            pool_recycle=DB_POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            pool_pre_ping=DB_POOL_PRE_PING if pool_pre_ping is None else pool_pre_ping,
+            echo=False,
+            future=True
+        )
+        instrument_pool_events(engine.pool)
 
         return engine
     except Exception as e:
@@ -41,13 +64,99 @@ def get_db_engine(pool_size: int = None, max_overflow: int = None) -> Engine:
             status_code=500, detail=f"Error connecting to the database: {e}")
 
 
+def get_async_db_connection_string() -> str:
+    # asyncpg does not accept libpq "options", the search_path is set through server_settings instead
+    db_conn_str = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    return db_conn_str
+
+
+def get_async_db_engine(pool_size: int = None, max_overflow: int = None, pool_timeout: float = None, pool_recycle: int = None, pool_pre_ping: bool = None) -> AsyncEngine:
+    try:
+        db_conn_str = get_async_db_connection_string()
+        connect_args = {"server_settings": {"search_path": DB_SCHEMA}} if DB_SCHEMA else {}
+
+        async_engine = create_async_engine(
+            db_conn_str,
+            connect_args=connect_args,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+            pool_recycle=DB_POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            pool_pre_ping=DB_POOL_PRE_PING if pool_pre_ping is None else pool_pre_ping,
+            echo=False
+        )
+        instrument_pool_events(async_engine.sync_engine.pool)
+
+        return async_engine
+    except Exception as e:
+        logger.error(f"Error connecting to the database: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error connecting to the database: {e}")
+
+
 def get_session() -> Generator[Session, None, None]:
-    session = SessionLocal()
+    session = get_sessionmaker()()
     try:
         yield session
     finally:
         session.close()
 
 
-engine = get_db_engine()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
+# Set in session.info by /batch (see batch.py): writes are flushed instead of committed, and the batch
+# commits or rolls back once after its last operation
+DEFER_COMMIT = "defer_commit"
+DEFERRED_INVALIDATIONS = "deferred_invalidations"
+
+
+def commit_or_defer(session: Session, obj: type | None = None, data: list[dict] | None = None) -> bool:
+    """Commit ``session``, or inside a batch only flush and note ``obj`` and ``data`` for invalidate_caches
+    to run again once the batch ends. Returns whether it committed."""
+    if session.info.get(DEFER_COMMIT):
+        session.flush()
+        if obj is not None:
+            session.info.setdefault(DEFERRED_INVALIDATIONS, []).append((obj, data))
+        return False
+    session.commit()
+    return True
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        # Created on first use so the sync-only deployment never needs asyncpg installed
+        async_engine = get_async_db_engine()
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# `engine` and `SessionLocal` are created on first use (see __getattr__ below) rather than at import,
+# so a serverless cold start does not pay for the driver import and engine setup before it is needed
+_init_lock = Lock()
+
+
+def get_sessionmaker() -> sessionmaker:
+    return globals().get("SessionLocal") or _init("SessionLocal")
+
+
+def _init(name: str):
+    with _init_lock:
+        if "engine" not in globals():
+            globals()["engine"] = get_db_engine()
+        if "SessionLocal" not in globals():
+            globals()["SessionLocal"] = sessionmaker(autocommit=False, autoflush=False, bind=globals()["engine"], class_=Session)
+        return globals()[name]
+
+
+def __getattr__(name: str):
+    # Only called for attributes not set yet; assigning database.engine / database.SessionLocal
+    # (as the benchmarks do) replaces them like any module attribute
+    if name in ("engine", "SessionLocal"):
+        return _init(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
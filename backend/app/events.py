@@ -0,0 +1,284 @@
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from starlette import status
+from .metrics import Counter, Gauge
+from . import database
+from .models import ReadProject, ReadTask
+from sqlalchemy.orm import Session
+from sqlalchemy import event, func, select
+from typing import AsyncIterator
+from itertools import count
+from threading import Event, Lock, Thread
+from os import getenv
+import logging
+import asyncio
+import select as select_module
+import json
+
+logger = logging.getLogger(__name__)
+
+# "auto" fans out through Postgres LISTEN/NOTIFY when the database is Postgres, so every worker
+# sees every change; "memory" keeps events inside the process (single worker, tests, SQLite)
+EVENTS_BACKEND = (getenv("EVENTS_BACKEND") or "auto").lower()
+EVENTS_CHANNEL = getenv("EVENTS_CHANNEL") or "task_tracker_events"
+# Events buffered per subscriber before it is considered too slow and told to resync
+EVENTS_QUEUE_SIZE = int(getenv("EVENTS_QUEUE_SIZE") or 256)
+EVENTS_HEARTBEAT_SECONDS = float(getenv("EVENTS_HEARTBEAT_SECONDS") or 15)
+
+# Keeps each NOTIFY payload well below Postgres' 8000 byte limit
+_MAX_IDS_PER_EVENT = 500
+_PENDING_KEY = "pending_change_events"
+RESYNC_EVENT = {"type": "resync"}
+
+events_published = Counter("events_published_total", "Change events delivered to the in-process bus", ["entity"])
+events_dropped = Counter("events_dropped_total", "Subscriber queues reset because the consumer fell behind")
+
+
+class Subscription:
+    def __init__(self, project_ids: set[int] | None, maxsize: int):
+        self.project_ids = project_ids
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._getter: asyncio.Future | None = None
+
+    def matches(self, change: dict) -> bool:
+        return self.project_ids is None or change.get("project_id") in self.project_ids or change["type"] == "resync"
+
+    def offer(self, change: dict) -> None:
+        # Runs on the subscriber's loop. A full queue means the consumer is behind: rather than block
+        # publishers or grow without bound, its backlog is replaced by a single resync marker.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            events_dropped.inc()
+            change = RESYNC_EVENT
+        self.queue.put_nowait(change)
+
+    def pending(self) -> asyncio.Future:
+        """The read of the next change, kept across timeouts until ``take`` collects it.
+
+        Cancelling a read that times out instead could drop a change it already took off the queue.
+        """
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self.queue.get())
+        return self._getter
+
+    def take(self) -> dict:
+        getter, self._getter = self._getter, None
+        return getter.result()
+
+    async def get(self, timeout: float) -> dict | None:
+        done, _ = await asyncio.wait({self.pending()}, timeout=timeout)
+        return self.take() if done else None
+
+    def close(self) -> None:
+        if self._getter is not None:
+            self._getter.cancel()
+            self._getter = None
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = Lock()
+        self._subscriptions: set[Subscription] = set()
+        self._sequence = count(1)
+
+    def subscribe(self, project_ids: list[int] | None = None) -> Subscription:
+        subscription = Subscription(set(project_ids) if project_ids else None, EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+        subscription.close()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, change: dict) -> None:
+        """Deliver ``change`` to matching subscribers; safe to call from any thread."""
+        change = {"seq": next(self._sequence), **change}
+        if change["type"] == "change":
+            events_published.inc(entity=change["entity"])
+
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(change)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, change)
+            except RuntimeError:
+                # The subscriber's loop is closed; it is removed when its stream ends
+                pass
+
+
+bus = EventBus()
+events_subscribers = Gauge("events_subscribers", "Open change feed connections", callback=lambda: len(bus))
+
+
+def _uses_postgres(session: Session) -> bool:
+    return EVENTS_BACKEND == "auto" and session.get_bind().dialect.name == "postgresql"
+
+
+def stage_change_events(session: Session, obj: type, action: str, rows: list[dict]) -> None:
+    """Queue change events for ``rows`` of ``obj`` in the session's current transaction.
+
+    Call before committing: with Postgres the NOTIFY is sent inside the transaction and delivered
+    only if it commits; otherwise events are published by the ``after_commit`` hook below.
+    """
+    if obj not in (ReadTask, ReadProject) or not rows:
+        return
+
+    if obj is ReadTask:
+        entity, pk_name = "task", "task_id"
+        # Partial updates (e.g. update_taskstatus_in_task) do not carry the project, so look it up
+        missing = [row[pk_name] for row in rows if row.get("project_id") is None]
+        known = dict(session.execute(
+            select(ReadTask.task_id, ReadTask.project_id).where(ReadTask.task_id.in_(missing))
+        ).all()) if missing else {}
+        projects = [(row[pk_name], row.get("project_id") or known.get(row[pk_name])) for row in rows]
+    else:
+        entity, pk_name = "project", "project_id"
+        projects = [(row[pk_name], row[pk_name]) for row in rows]
+
+    by_project: dict[int | None, list[int]] = {}
+    for pk, project_id in projects:
+        by_project.setdefault(project_id, []).append(pk)
+
+    changes = [
+        {"type": "change", "entity": entity, "action": action, "project_id": project_id, "ids": ids[start:start + _MAX_IDS_PER_EVENT]}
+        for project_id, ids in by_project.items()
+        for start in range(0, len(ids), _MAX_IDS_PER_EVENT)
+    ]
+
+    if _uses_postgres(session):
+        for change in changes:
+            session.execute(select(func.pg_notify(EVENTS_CHANNEL, json.dumps(change))))
+    else:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for change in session.info.pop(_PENDING_KEY, []):
+        bus.publish(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class PostgresListener(Thread):
+    """Background thread relaying NOTIFY payloads from every worker to this process's bus."""
+
+    def __init__(self, engine):
+        super().__init__(name="events-listener", daemon=True)
+        self.engine = engine
+        self._stop_event = Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        backoff, connected_before = 1.0, False
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                # Detached so the long-lived LISTEN connection does not hold a pool slot
+                connection = self.engine.raw_connection()
+                connection.detach()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{EVENTS_CHANNEL}"')
+                if connected_before:
+                    # Changes may have been missed while disconnected
+                    bus.publish(RESYNC_EVENT)
+                connected_before, backoff = True, 1.0
+
+                while not self._stop_event.is_set():
+                    if select_module.select([dbapi_connection], [], [], 1.0)[0]:
+                        dbapi_connection.poll()
+                        while dbapi_connection.notifies:
+                            notification = dbapi_connection.notifies.pop(0)
+                            bus.publish(json.loads(notification.payload))
+            except Exception:
+                logger.exception("Change feed listener failed, reconnecting in %.0fs", backoff)
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+_listener: PostgresListener | None = None
+_listener_lock = Lock()
+
+
+def ensure_listener() -> None:
+    global _listener
+    if EVENTS_BACKEND != "auto" or database.engine.dialect.name != "postgresql":
+        return
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = PostgresListener(database.engine)
+            _listener.start()
+
+
+def stop_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+async def iter_sse(project_ids: list[int]) -> AsyncIterator[str]:
+    # Subscribed once streaming starts, so a client gone before then leaves nothing behind
+    subscription = bus.subscribe(project_ids)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            change = await subscription.get(EVENTS_HEARTBEAT_SECONDS)
+            if change is None:
+                # Comment lines keep proxies from closing an idle stream
+                yield ": ping\n\n"
+                continue
+            yield f"id: {change['seq']}\nevent: {change['type']}\ndata: {json.dumps(change)}\n\n"
+    finally:
+        bus.unsubscribe(subscription)
+
+
+async def stream_websocket(websocket: WebSocket, project_ids: list[int]) -> None:
+    """Send changes to an accepted socket; ``{"type": "subscribe", "project_ids": [...]}`` changes the filter.
+
+    A message that is not valid JSON or has non-integer project ids closes the socket with 1003.
+    """
+    subscription = bus.subscribe(project_ids)
+
+    async def receive() -> None:
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and message.get("type") == "subscribe":
+                    subscription.project_ids = {int(p) for p in message.get("project_ids") or []} or None
+        except WebSocketDisconnect:
+            pass
+        except (ValueError, TypeError):
+            await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while True:
+            getter = subscription.pending()
+            done, _ = await asyncio.wait({getter, receiver}, timeout=EVENTS_HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                break
+            await websocket.send_json(subscription.take() if getter in done else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        bus.unsubscribe(subscription)
@@ -0,0 +1,58 @@
+from sqlalchemy.orm import joinedload
+from fastapi import HTTPException, Query, status
+from .models import ReadProject, ReadTask
+from sqlmodel import SQLModel
+
+TASK_EXPANSIONS = {"owner": ReadTask.owner, "status": ReadTask.status, "project": ReadTask.project}
+# Only many-to-one relations: a project's tasks are unbounded, so they are paged through /projects/{id}/tasks
+PROJECT_EXPANSIONS = {"owner": ReadProject.owner}
+
+# Never serialize credentials of expanded users, even though FilteredReadUser would drop them too
+_EXCLUDED_FIELDS = {"hashed_password", "refresh_token"}
+
+
+class ExpandParams:
+    """``?expand=owner,status`` dependency returning the requested relationship names."""
+
+    def __init__(self, expansions: dict):
+        self.expansions = expansions
+
+    def __call__(self, expand: str | None = Query(None, description="Comma separated relationships to include")) -> list[str]:
+        if not expand:
+            return []
+
+        names = list(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.expansions]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown expand value(s) {unknown}. Allowed: {sorted(self.expansions)}"
+            )
+        return names
+
+    def options(self, names: list[str]) -> list:
+        # Joined into the main query, so the number of statements never depends on the number of rows returned
+        return [joinedload(self.expansions[name]) for name in names]
+
+
+task_expand = ExpandParams(TASK_EXPANSIONS)
+project_expand = ExpandParams(PROJECT_EXPANSIONS)
+
+
+def _dump(obj: SQLModel | None) -> dict | None:
+    return obj.model_dump(exclude=_EXCLUDED_FIELDS) if obj is not None else None
+
+
+def expand_rows(rows: list[SQLModel] | SQLModel | None, names: list[str]) -> list[dict] | dict | None:
+    if rows is None:
+        return None
+    if not isinstance(rows, list):
+        return expand_rows([rows], names)[0]
+
+    expanded = []
+    for row in rows:
+        data = row.model_dump()
+        for name in names:
+            data[name] = _dump(getattr(row, name))
+        expanded.append(data)
+    return expanded
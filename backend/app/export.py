@@ -0,0 +1,64 @@
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime
+from sqlmodel import SQLModel, select
+from typing import Iterator, Literal
+from . import database
+from os import getenv
+import json
+import csv
+import io
+
+# Rows fetched per round-trip from the server-side cursor and written per response chunk
+EXPORT_CHUNK_ROWS = int(getenv("EXPORT_CHUNK_ROWS") or 1000)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _to_text(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_export_rows(obj: type[SQLModel], filters: list, export_format: Literal["ndjson", "csv"]) -> Iterator[str]:
+    pk_col = list(obj.__table__.primary_key.columns)[0]
+    statement = (
+        select(*obj.__table__.columns)
+        .where(*filters)
+        .order_by(pk_col)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+
+    # The request-scoped session is closed before a streamed body is sent, so the stream owns its own
+    with database.SessionLocal() as session:
+        result = session.execute(statement)
+        columns = list(result.keys())
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(columns)
+
+        for rows in result.partitions():
+            for row in rows:
+                if export_format == "csv":
+                    writer.writerow([_to_text(value) for value in row])
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_to_text))
+                    buffer.write("\n")
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def export_response(obj: type[SQLModel], filters: list, export_format: Literal["ndjson", "csv"]) -> StreamingResponse:
+    filename = f"{obj.__tablename__}.{'csv' if export_format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        iter_export_rows(obj, filters, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,49 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import Session, SQLModel, select
+from fastapi import Response
+from .pagination import PageParams
+from os import getenv
+import orjson
+
+# Opt-in: list routes without ?expand= fetch plain column tuples and serialize them with orjson instead
+# of loading ORM instances and validating every row through the response model. Rows come straight
+# from our own tables, so the response model is only used to pick (and never widen) the columns.
+FAST_JSON_RESPONSES = (getenv("FAST_JSON_RESPONSES") or "false").lower() == "true"
+
+# OPT_UTC_Z writes aware UTC datetimes as "...Z", the way pydantic does
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def fast_path_enabled(expand: list[str] | None = None) -> bool:
+    return FAST_JSON_RESPONSES and not expand
+
+
+def _row_statement(obj: type[SQLModel], response_model: type[SQLModel], filters: list, page: PageParams):
+    table = obj.__table__
+    statement = select(*(table.columns[name] for name in response_model.model_fields)).where(*filters)
+    return page.apply(statement, obj)
+
+
+def _render(response: Response, rows: list, response_model: type[SQLModel], obj: type[SQLModel], page: PageParams) -> ORJSONResponse:
+    # Row objects expose columns as attributes, so the usual cursor bookkeeping works on them unchanged
+    rows = page.finalize(response, rows, obj)
+    fields = list(response_model.model_fields)
+    # A returned Response replaces FastAPI's, so headers set on it (e.g. X-Next-Cursor) are carried over
+    return ORJSONResponse([dict(zip(fields, row)) for row in rows], headers=dict(response.headers))
+
+
+def fast_list_response(session: Session, response: Response, obj: type[SQLModel], response_model: type[SQLModel], filters: list, page: PageParams) -> ORJSONResponse:
+    rows = session.execute(_row_statement(obj, response_model, filters, page)).all()
+    return _render(response, rows, response_model, obj, page)
+
+
+async def async_fast_list_response(session: AsyncSession, response: Response, obj: type[SQLModel], response_model: type[SQLModel], filters: list, page: PageParams) -> ORJSONResponse:
+    rows = (await session.execute(_row_statement(obj, response_model, filters, page))).all()
+    return _render(response, rows, response_model, obj, page)
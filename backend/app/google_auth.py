@@ -0,0 +1,134 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from .metrics import Counter
+from .cache import TTLCache
+from threading import Lock
+from os import getenv
+import hashlib
+import time
+import re
+
+GOOGLE_CLIENT_ID = getenv("GOOGLE_CLIENT_ID")
+# Overridable so tests and benchmarks can point verification at a local stand-in for Google's key endpoint
+GOOGLE_CERTS_URL = getenv("GOOGLE_CERTS_URL") or "https://www.googleapis.com/oauth2/v1/certs"
+# Verified claims are reused for retries of the same token, never past the token's own exp
+GOOGLE_TOKEN_CACHE_SECONDS = float(getenv("GOOGLE_TOKEN_CACHE_SECONDS") or 60)
+GOOGLE_HTTP_TIMEOUT = float(getenv("GOOGLE_HTTP_TIMEOUT") or 5)
+GOOGLE_HTTP_POOL_SIZE = int(getenv("GOOGLE_HTTP_POOL_SIZE") or 10)
+
+_GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+_NOT_CACHEABLE = re.compile(r"(?:^|,)\s*(?:no-store|no-cache)\b", re.IGNORECASE)
+
+google_certs_fetches = Counter("google_certs_fetches_total", "Google signing certificate downloads")
+google_token_verifications = Counter(
+    "google_token_verifications_total", "Google ID token checks, by whether the claims cache answered", ["result"])
+
+
+def cache_lifetime(headers) -> float:
+    """Seconds a response may be reused per its Cache-Control, Age and Expires headers (0 if not at all)."""
+    headers = {name.lower(): value for name, value in headers.items()}
+    cache_control = headers.get("cache-control", "")
+    if _NOT_CACHEABLE.search(cache_control):
+        return 0.0
+
+    if match := _MAX_AGE.search(cache_control):
+        age = headers.get("age", "0")
+        return max(float(match.group(1)) - (float(age) if age.isdigit() else 0.0), 0.0)
+
+    if "expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["expires"])
+            date = parsedate_to_datetime(headers["date"]) if "date" in headers else datetime.now(timezone.utc)
+            return max((expires - date).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+class CachingRequest:
+    """google.auth transport over one pooled HTTP session that reuses GET responses while they are fresh.
+
+    Google's certs endpoint sends a max-age of several hours, so keys are downloaded a few times a
+    day per process instead of on every login.
+    """
+
+    def __init__(self, request):
+        self._request = request
+        self._cache = TTLCache(maxsize=16)
+        self._lock = Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method != "GET" or body is not None:
+            return self._request(url, method=method, body=body, headers=headers, timeout=timeout or GOOGLE_HTTP_TIMEOUT, **kwargs)
+
+        response = self._cache.get(url)
+        if response is None:
+            # Logins arriving together on an empty cache share one download
+            with self._lock:
+                response = self._cache.get(url)
+                if response is None:
+                    response = self._request(url, method=method, headers=headers, timeout=timeout or GOOGLE_HTTP_TIMEOUT, **kwargs)
+                    if url == GOOGLE_CERTS_URL:
+                        google_certs_fetches.inc()
+                    ttl = cache_lifetime(response.headers)
+                    if response.status == 200 and ttl > 0:
+                        self._cache.set(url, response, ttl)
+        return response
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+@lru_cache(maxsize=1)
+def google_transport() -> CachingRequest:
+    # Imported on first use: google-auth and requests are only needed by Google sign-in
+    from google.auth.transport.requests import Request
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=GOOGLE_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return CachingRequest(Request(session))
+
+
+google_claims_cache = TTLCache(maxsize=1024, ttl=GOOGLE_TOKEN_CACHE_SECONDS)
+# Striped so concurrent retries of one token verify it once without a lock per token
+_token_locks = [Lock() for _ in range(32)]
+
+
+def _verify(token: str) -> dict:
+    from google.oauth2 import id_token
+    from google.auth import exceptions
+
+    claims = id_token.verify_token(token, google_transport(), audience=GOOGLE_CLIENT_ID, certs_url=GOOGLE_CERTS_URL)
+    if claims.get("iss") not in _GOOGLE_ISSUERS:
+        raise exceptions.GoogleAuthError(f"Wrong issuer. 'iss' should be one of the following: {_GOOGLE_ISSUERS}")
+    return claims
+
+
+def verify_google_id_token(token: str) -> dict:
+    """Claims of a Google ID token, like ``id_token.verify_oauth2_token`` but with cached keys and results.
+
+    Raises whatever google-auth raises for invalid tokens; failures are not cached.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    claims = google_claims_cache.get(key)
+    if claims is not None:
+        google_token_verifications.inc(result="cached")
+        return claims
+
+    with _token_locks[int(key[:8], 16) % len(_token_locks)]:
+        claims = google_claims_cache.get(key)
+        if claims is not None:
+            google_token_verifications.inc(result="cached")
+            return claims
+
+        claims = _verify(token)
+        google_token_verifications.inc(result="verified")
+        ttl = min(GOOGLE_TOKEN_CACHE_SECONDS, float(claims.get("exp", 0)) - time.time())
+        if ttl > 0:
+            google_claims_cache.set(key, claims, ttl)
+        return claims
@@ -0,0 +1,125 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .metrics import Histogram
+from time import perf_counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Iterator
+from os import getenv
+
+INSTRUMENTATION_ENABLED = (getenv("INSTRUMENTATION_ENABLED") or "true").lower() == "true"
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"])
+http_request_db_statements = Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+http_request_db_duration = Histogram(
+    "http_request_db_seconds", "Total time spent executing SQL per HTTP request", ["route"])
+auth_duration = Histogram(
+    "auth_verify_duration_seconds", "Time spent in verify_access_token")
+
+
+class RequestStats:
+    __slots__ = ("db_statements", "db_seconds", "auth_seconds", "bcrypt_seconds")
+
+    def __init__(self):
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        self.auth_seconds = 0.0
+        self.bcrypt_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        parts = [
+            f"app;dur={total_seconds * 1000:.2f}",
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_statements} queries"',
+        ]
+        if self.auth_seconds:
+            parts.append(f"auth;dur={self.auth_seconds * 1000:.2f}")
+        if self.bcrypt_seconds:
+            parts.append(f"bcrypt;dur={self.bcrypt_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+# A mutable object per request, so time recorded in threadpool workers (which run on a copy of
+# the context) still lands on the request that started them
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+@contextmanager
+def timed_auth() -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        auth_duration.observe(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.auth_seconds += elapsed
+
+
+def record_bcrypt_time(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.bcrypt_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _request_stats.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.db_statements += 1
+        stats.db_seconds += perf_counter() - conn.info["query_start"].pop()
+
+
+def install_sql_hooks() -> None:
+    # Listening on the Engine class covers the sync engine, the async engine and any test engines
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware recording per-route latency and DB usage, and adding Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(perf_counter() - start).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = perf_counter() - start
+            route = scope.get("route")
+            # Unmatched paths share one label so arbitrary URLs cannot blow up metric cardinality
+            route_label = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(elapsed, method=scope["method"], route=route_label, status=str(status_code))
+            http_request_db_statements.observe(stats.db_statements, route=route_label)
+            http_request_db_duration.observe(stats.db_seconds, route=route_label)
+            _request_stats.reset(token)
@@ -1,11 +1,42 @@
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI
+from .passwords import shutdown_password_executor
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
+from .pagination import NEXT_CURSOR_HEADER
+from .instrumentation import INSTRUMENTATION_ENABLED, InstrumentationMiddleware, install_sql_hooks
+from .metrics import render_latest
+from .events import stop_listener
+from .database import DB_ASYNC_MODE
+from . import database
+from .utils import verify_monitoring_access
+from fastapi import FastAPI, Depends
 from .api import router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at startup; permissions compile on the first scope check
+    yield
+    shutdown_password_executor()
+    stop_listener()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if DB_ASYNC_MODE:
+    from .async_api import router as async_router
+
+    # Registered first so its routes take precedence over the sync ones with the same path
+    app.include_router(async_router, prefix="/api")
 
 app.include_router(router, prefix="/api")
 
+if INSTRUMENTATION_ENABLED:
+    install_sql_hooks()
+    app.add_middleware(InstrumentationMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -15,10 +46,16 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"]
 )
 
 
 @app.get("/")
 def root():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(verify_monitoring_access)])
+def metrics() -> str:
+    return render_latest()
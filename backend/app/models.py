@@ -1,19 +1,30 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DDL, Index, event, text
 from datetime import date, datetime, timezone
 from pydantic import BaseModel
+from typing import Any, Literal
 
 
 def get_time() -> datetime:
     return datetime.now(timezone.utc).replace(microsecond=0)
 
 
+def _active_only(flag: str) -> dict:
+    # Partial index predicate. List filters compare the flag to a literal (``= true``, ``= 1`` on
+    # SQLite) rather than a bound parameter, so both planners can prove it and use the index.
+    return {"postgresql_where": text(flag), "sqlite_where": text(f"{flag} = 1")}
+
+
 class JWTPayloadBase(BaseModel):
     user_id: int
     first_name: str
     last_name: str
     email: str
     role_name: str
-    role_permissions: str
+    # The role's permissions as bits of the compiled permission set named by permission_version.
+    # Tokens issued before these claims have neither and are sent back to refresh.
+    permission_mask: int | None = None
+    permission_version: str | None = None
 
 
 class JWTPayload(JWTPayloadBase):
@@ -51,6 +62,13 @@ class ReadRolePermissions(SQLModel, table=True):
     role_permissions_name: str = Field(primary_key=True)
 
 
+class ReadRolePermissionLink(SQLModel, table=True):
+    __tablename__ = "role_permission_links"
+
+    role_id: int = Field(foreign_key="roles.role_id", primary_key=True)
+    role_permissions_name: str = Field(foreign_key="role_permissions.role_permissions_name", primary_key=True)
+
+
 class WriteTaskStatus(SQLModel):
     task_status_name: str = Field(index=True, unique=True, max_length=50)
     task_status_active: bool = True
@@ -62,6 +80,9 @@ class WriteTaskStatus(SQLModel):
 
 class ReadTaskStatus(WriteTaskStatus, table=True):
     __tablename__ = "task_status"
+    __table_args__ = (
+        Index("ix_task_status_modified_on_date_task_status_id", "modified_on_date", "task_status_id"),
+    )
 
     task_status_id: int | None = Field(default=None, primary_key=True)
 
@@ -97,6 +118,11 @@ class FilteredReadUser(UserBase):
 
 class ReadUser(UserBase, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_id", "role_id"),
+        Index("ix_users_modified_on_date_user_id", "modified_on_date", "user_id"),
+        Index("ix_users_active_role_id_user_id", "role_id", "user_id", **_active_only("user_active")),
+    )
 
     user_id: int | None = Field(default=None, primary_key=True)
     hashed_password: str = Field(max_length=255)
@@ -122,6 +148,11 @@ class WriteProject(SQLModel):
 
 class ReadProject(WriteProject, table=True):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_owner_id", "owner_id"),
+        Index("ix_projects_modified_on_date_project_id", "modified_on_date", "project_id"),
+        Index("ix_projects_active_owner_id_project_id", "owner_id", "project_id", **_active_only("project_active")),
+    )
 
     project_id: int | None = Field(default=None, primary_key=True)
 
@@ -144,6 +175,16 @@ class WriteTask(SQLModel):
 
 class ReadTask(WriteTask, table=True):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_task_id", "project_id", "task_id"),
+        Index("ix_tasks_owner_id", "owner_id"),
+        Index("ix_tasks_task_status_id", "task_status_id"),
+        Index("ix_tasks_modified_on_date_task_id", "modified_on_date", "task_id"),
+        Index("ix_tasks_active_project_id_task_id", "project_id", "task_id", **_active_only("task_active")),
+        Index("ix_tasks_active_owner_id_task_id", "owner_id", "task_id", **_active_only("task_active")),
+        Index("ix_tasks_active_task_status_id_task_id", "task_status_id", "task_id", **_active_only("task_active")),
+        Index("ix_tasks_active_project_id_task_status_id_task_id", "project_id", "task_status_id", "task_id", **_active_only("task_active")),
+    )
 
     task_id: int | None = Field(default=None, primary_key=True)
 
@@ -152,6 +193,124 @@ class ReadTask(WriteTask, table=True):
     project: ReadProject = Relationship(back_populates="tasks")
 
 
+class ReadRateLimitBucket(SQLModel, table=True):
+    """Token bucket state shared by all workers when rate limits are kept in Postgres (see rate_limit.py)."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    bucket_key: str = Field(primary_key=True, max_length=64)
+    tokens: float
+    # Unix time of the last refill
+    updated_at: float = Field(index=True)
+    # Whether the last request against the bucket was let through
+    allowed: bool = True
+
+
+# Postgres-only full text search columns. They are generated by the database and not mapped on the
+# models, so the ORM never reads or writes them; SQLite test databases are created without them.
+# Existing databases get them from migration 0003, and /search answers 503 until then.
+SEARCH_VECTOR_COLUMN = "search_vector"
+for _table, _vector in (
+    (ReadTask.__table__, "to_tsvector('english', coalesce(task_description, ''))"),
+    (ReadProject.__table__, "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+                            "setweight(to_tsvector('english', coalesce(project_description, '')), 'B')"),
+):
+    event.listen(_table, "after_create", DDL(
+        f"ALTER TABLE %(fullname)s ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector GENERATED ALWAYS AS ({_vector}) STORED"
+    ).execute_if(dialect="postgresql"))
+    event.listen(_table, "after_create", DDL(
+        f"CREATE INDEX ix_%(table)s_{SEARCH_VECTOR_COLUMN} ON %(fullname)s USING gin ({SEARCH_VECTOR_COLUMN})"
+    ).execute_if(dialect="postgresql"))
+
+
+class TaskStatusSummary(WriteTaskStatus):
+    task_status_id: int
+
+
+class ProjectSummary(WriteProject):
+    project_id: int
+
+
+class TaskSummary(WriteTask):
+    task_id: int
+
+
+class ExpandedReadTask(TaskSummary):
+    owner: FilteredReadUser | None = None
+    status: TaskStatusSummary | None = None
+    project: ProjectSummary | None = None
+
+
+class ExpandedReadProject(ProjectSummary):
+    owner: FilteredReadUser | None = None
+
+
+class SearchResult(SQLModel):
+    type: str
+    id: int
+    title: str
+    project_id: int
+    rank: float
+
+
+class BoardColumn(SQLModel):
+    task_status_id: int
+    task_status_name: str
+    total: int
+    tasks: list[TaskSummary]
+    next_cursor: str | None = None
+
+
+class Board(SQLModel):
+    project_id: int
+    columns: list[BoardColumn]
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PATCH"]
+    # Relative to /api, with an optional query string, e.g. "/projects/1/tasks?task_status_id=2"
+    path: str
+    body: Any = None
+
+
+class PatchBase(SQLModel):
+    # The version the client last read; the patch is rejected as a conflict if the row changed since
+    modified_on_date: datetime
+
+
+class PatchRole(PatchBase):
+    role_id: int
+    role_name: str | None = Field(default=None, max_length=50)
+    role_permissions: str | None = None
+    role_active: bool | None = None
+
+
+class PatchTaskStatus(PatchBase):
+    task_status_id: int
+    task_status_name: str | None = Field(default=None, max_length=50)
+    task_status_active: bool | None = None
+
+
+class PatchProject(PatchBase):
+    project_id: int
+    project_name: str | None = Field(default=None, max_length=150)
+    project_description: str | None = None
+    project_start_date: date | None = None
+    project_end_date: date | None = None
+    owner_id: int | None = None
+    project_active: bool | None = None
+
+
+class PatchTask(PatchBase):
+    task_id: int
+    task_description: str | None = None
+    task_due_date: date | None = None
+    task_status_id: int | None = None
+    owner_id: int | None = None
+    project_id: int | None = None
+    task_active: bool | None = None
+
+
 # Forward references
 ReadUser.model_rebuild()
 ReadRole.model_rebuild()
@@ -0,0 +1,91 @@
+from fastapi import HTTPException, Query, Response, status
+from datetime import date, datetime
+from sqlalchemy import tuple_
+from sqlmodel import SQLModel
+from typing import Literal
+import base64
+import json
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: int | date | datetime, pk_value: int) -> str:
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, pk_value], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_col) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, pk_value = json.loads(raw)
+        python_type = sort_col.type.python_type
+        if python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif python_type is date:
+            sort_value = date.fromisoformat(sort_value)
+        else:
+            sort_value = python_type(sort_value)
+        return sort_value, int(pk_value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+class PageParams:
+    """Keyset pagination query parameters shared by every list endpoint.
+
+    Every list is paged, ``DEFAULT_PAGE_LIMIT`` rows at a time unless ``limit`` says
+    otherwise; the full table is only available through the export endpoints. Pages are
+    ordered by ``(sort column, primary key)`` and the cursor for the following page is
+    returned in the ``X-Next-Cursor`` response header.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+        cursor: str | None = Query(None),
+        sort: Literal["id", "modified_on_date"] = Query("id"),
+        order: Literal["asc", "desc"] = Query("asc")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.descending = order == "desc"
+
+    def columns(self, obj: type[SQLModel]) -> tuple:
+        pk_col = list(obj.__table__.primary_key.columns)[0]
+        sort_col = pk_col if self.sort == "id" else obj.__table__.columns[self.sort]
+        return sort_col, pk_col
+
+    def after_cursor(self, keys: list, sort_col):
+        """Condition selecting rows past the cursor; ``keys`` are the sort (and primary key) expressions."""
+        sort_value, pk_value = decode_cursor(self.cursor, sort_col)
+        values = [sort_value] if len(keys) == 1 else [sort_value, pk_value]
+        lhs, rhs = (keys[0], values[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*values))
+        return lhs < rhs if self.descending else lhs > rhs
+
+    def ordering(self, keys: list) -> list:
+        return [k.desc() if self.descending else k.asc() for k in keys]
+
+    def apply(self, statement, obj: type[SQLModel]):
+        sort_col, pk_col = self.columns(obj)
+        keys = [sort_col] if sort_col is pk_col else [sort_col, pk_col]
+
+        if self.cursor:
+            statement = statement.where(self.after_cursor(keys, sort_col))
+
+        # One extra row tells us whether another page exists without a COUNT query
+        return statement.order_by(*self.ordering(keys)).limit(self.limit + 1)
+
+    def finalize(self, response: Response, rows: list[SQLModel], obj: type[SQLModel]) -> list[SQLModel]:
+        if len(rows) <= self.limit:
+            return rows
+
+        rows = rows[:self.limit]
+        sort_col, pk_col = self.columns(obj)
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, sort_col.name), getattr(last, pk_col.name))
+        return rows
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+from .metrics import Counter, Gauge, Histogram
+from .instrumentation import record_bcrypt_time
+from fastapi import HTTPException, status
+from functools import lru_cache
+from time import perf_counter
+from threading import Lock
+from os import getenv, cpu_count
+import multiprocessing
+import asyncio
+
+# bcrypt is CPU-bound, so it runs in worker processes rather than the request threadpool
+PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS") or cpu_count() or 1)
+# Requests allowed to wait for a free worker before new ones are rejected with 503
+PASSWORD_HASH_MAX_QUEUE = int(getenv("PASSWORD_HASH_MAX_QUEUE") or 64)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = Lock()
+_in_flight = 0
+
+password_hash_queue_wait = Histogram(
+    "password_hash_queue_wait_seconds", "Time password hashing jobs waited for a worker process", ["operation"])
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds", "Time spent inside bcrypt per password hashing job", ["operation"])
+password_hash_rejected = Counter(
+    "password_hash_rejected_total", "Password hashing jobs rejected because the queue was full", ["operation"])
+password_hash_in_flight = Gauge(
+    "password_hash_in_flight", "Password hashing jobs queued or running", callback=lambda: _in_flight)
+
+
+@lru_cache(maxsize=1)
+def pwd_context():
+    # passlib is imported on the first hash or verify, not when the app starts
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+def _timed_hash(password: str) -> tuple[str, float]:
+    start = perf_counter()
+    hashed = pwd_context().hash(password)
+    return hashed, perf_counter() - start
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> tuple[bool, float]:
+    start = perf_counter()
+    valid = pwd_context().verify(plain_password, hashed_password)
+    return valid, perf_counter() - start
+
+
+def get_password_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown_password_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def _run_in_pool(operation: str, fn, *args):
+    global _in_flight
+    with _executor_lock:
+        if _in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+            password_hash_rejected.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"}
+            )
+        _in_flight += 1
+
+    start = perf_counter()
+    try:
+        result, hash_time = await asyncio.wrap_future(get_password_executor().submit(fn, *args))
+    finally:
+        with _executor_lock:
+            _in_flight -= 1
+
+    record_bcrypt_time(hash_time)
+    password_hash_duration.observe(hash_time, operation=operation)
+    password_hash_queue_wait.observe(max(perf_counter() - start - hash_time, 0.0), operation=operation)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool("hash", _timed_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool("verify", _timed_verify, plain_password, hashed_password)
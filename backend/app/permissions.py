@@ -0,0 +1,158 @@
+from .models import ReadRole, ReadRolePermissionLink, ReadRolePermissions
+from sqlmodel import Session, SQLModel, select
+from sqlalchemy import delete
+from sqlalchemy.engine import Engine
+from threading import Lock
+from typing import Iterable
+from os import getenv
+from .conditional import invalidate_reference_data
+from . import database
+import hashlib
+import logging
+import time
+import ast
+
+logger = logging.getLogger(__name__)
+
+# Bits only move when a permission is added or removed. Writes in this process recompile
+# immediately; other workers recompile within the TTL, or sooner for a token with another version.
+PERMISSIONS_CACHE_TTL_SECONDS = float(getenv("PERMISSIONS_CACHE_TTL_SECONDS") or 300)
+# Tokens with an unknown version recompile at most this often, so bogus ones cannot hammer the DB
+_RECOMPILE_MIN_SECONDS = 5
+
+
+def parse_permissions(role_permissions: str | None) -> frozenset[str]:
+    """Permission names in a role_permissions string, which is only read to write the role's link rows."""
+    return frozenset(ast.literal_eval(role_permissions or "[]"))
+
+
+class CompiledPermissions:
+    """One bit per permission name, in name order, tagged with a version derived from the names."""
+
+    def __init__(self, names: Iterable[str]):
+        names = sorted(set(names))
+        self.bits = {name: 1 << position for position, name in enumerate(names)}
+        self.version = hashlib.sha1("\n".join(names).encode()).hexdigest()[:12]
+        self._required: dict[tuple[str, ...], tuple[int, bool]] = {}
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def required(self, scopes: tuple[str, ...]) -> tuple[int, bool]:
+        """Mask of ``scopes`` and whether every scope is a known permission."""
+        required = self._required.get(scopes)
+        if required is None:
+            required = self._required[scopes] = (self.mask(scopes), all(scope in self.bits for scope in scopes))
+        return required
+
+    def allows(self, permission_mask: int, scopes: tuple[str, ...], require_all: bool) -> bool:
+        required, all_known = self.required(scopes)
+        if require_all:
+            return all_known and permission_mask & required == required
+        return permission_mask & required != 0
+
+
+class PermissionRegistry:
+    def __init__(self):
+        self._lock = Lock()
+        self._compiled: CompiledPermissions | None = None
+        self._compiled_at = float("-inf")
+
+    def compile(self, session: Session) -> CompiledPermissions:
+        compiled = CompiledPermissions(session.exec(select(ReadRolePermissions.role_permissions_name)).all())
+        with self._lock:
+            self._compiled, self._compiled_at = compiled, time.monotonic()
+        return compiled
+
+    def current(self, version: str | None = None) -> CompiledPermissions:
+        """The compiled permissions, compiled on first use and again once stale or, for a token's
+        ``version`` that differs, possibly behind another worker's."""
+        compiled, age = self._compiled, time.monotonic() - self._compiled_at
+        if compiled is not None and age < PERMISSIONS_CACHE_TTL_SECONDS:
+            if version is None or version == compiled.version or age < _RECOMPILE_MIN_SECONDS:
+                return compiled
+        try:
+            with database.SessionLocal() as session:
+                return self.compile(session)
+        except Exception:
+            if compiled is None:
+                raise
+            logger.exception("Could not recompile permissions, keeping the previous ones")
+            # Retried after the TTL rather than on every request
+            with self._lock:
+                self._compiled_at = time.monotonic()
+            return compiled
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._compiled, self._compiled_at = None, float("-inf")
+
+    def claims(self, session: Session, names: list[str]) -> dict:
+        """Token claims granting ``names``: their mask and the version its bits belong to."""
+        compiled = self._compiled
+        if (compiled is None or time.monotonic() - self._compiled_at >= PERMISSIONS_CACHE_TTL_SECONDS
+                or any(name not in compiled.bits for name in names)):
+            # With the caller's session, so issuing a token needs no second connection
+            compiled = self.compile(session)
+        return {"permission_mask": compiled.mask(names), "permission_version": compiled.version}
+
+
+permission_registry = PermissionRegistry()
+
+
+def role_permission_names(session: Session, role_id: int) -> list[str]:
+    statement = (
+        select(ReadRolePermissionLink.role_permissions_name)
+        .where(ReadRolePermissionLink.role_id == role_id)
+        .order_by(ReadRolePermissionLink.role_permissions_name)
+    )
+    return list(session.exec(statement).all())
+
+
+def sync_role_permission_links(session: Session, role_ids: list[int] | None = None) -> int:
+    """Rewrite the link rows of ``role_ids`` (all roles if None) from their role_permissions strings.
+
+    Role writes send the string; authorization only reads the links. Permission names used by a role
+    but missing from role_permissions are added, so its mask grants exactly what its string lists.
+    Returns the number of links written.
+    """
+    statement = select(ReadRole.role_id, ReadRole.role_permissions)
+    if role_ids is not None:
+        statement = statement.where(ReadRole.role_id.in_(role_ids))
+    roles = {role_id: parse_permissions(permissions) for role_id, permissions in session.exec(statement).all()}
+    if not roles:
+        return 0
+
+    known = set(session.exec(select(ReadRolePermissions.role_permissions_name)).all())
+    missing = set().union(*roles.values()) - known
+    session.add_all(ReadRolePermissions(role_permissions_name=name) for name in sorted(missing))
+
+    session.execute(delete(ReadRolePermissionLink).where(ReadRolePermissionLink.role_id.in_(list(roles))))
+    links = [
+        ReadRolePermissionLink(role_id=role_id, role_permissions_name=name)
+        for role_id, names in roles.items() for name in sorted(names)
+    ]
+    session.add_all(links)
+    database.commit_or_defer(session, ReadRolePermissions if missing else None)
+
+    if missing:
+        permission_registry.invalidate()
+        invalidate_reference_data()
+    return len(links)
+
+
+def migrate_role_permissions(engine: Engine) -> dict:
+    """Create the link table if needed and backfill it from every role's role_permissions string."""
+    SQLModel.metadata.create_all(engine, tables=[ReadRolePermissionLink.__table__])
+    with Session(engine) as session:
+        links = sync_role_permission_links(session)
+        compiled = permission_registry.compile(session)
+    return {"links": links, "permissions": len(compiled.bits), "version": compiled.version}
+
+
+if __name__ == "__main__":
+    # cd backend && python -m app.permissions
+    print(migrate_role_permissions(database.engine))
@@ -0,0 +1,79 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from .metrics import Counter, Gauge, Histogram
+from sqlalchemy.exc import TimeoutError
+from time import perf_counter
+from sqlalchemy import event
+
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection", ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0))
+db_pool_checkout_timeouts = Counter(
+    "db_pool_checkout_timeouts_total", "Connection checkouts that timed out because the pool was exhausted", ["pool"])
+db_pool_invalidations = Counter(
+    "db_pool_invalidations_total", "Pooled connections invalidated (hard: closed, soft: recycled on next checkout)", ["pool", "kind"])
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["pool"])
+db_pool_overflow = Gauge(
+    "db_pool_overflow", "Connections currently open beyond pool_size", ["pool"])
+
+
+class _InstrumentedPoolMixin:
+    pool_label = "sync"
+
+    def _record_usage(self) -> None:
+        db_pool_checked_out.set(self.checkedout(), pool=self.pool_label)
+        db_pool_overflow.set(max(self.overflow(), 0), pool=self.pool_label)
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            conn = super()._do_get()
+        except TimeoutError:
+            db_pool_checkout_timeouts.inc(pool=self.pool_label)
+            raise
+        finally:
+            db_pool_checkout_wait.observe(perf_counter() - start, pool=self.pool_label)
+
+        self._record_usage()
+        return conn
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._record_usage()
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pool_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pool_label = "async"
+
+
+def instrument_pool_events(pool: Pool) -> None:
+    label = getattr(pool, "pool_label", "sync")
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        db_pool_invalidations.inc(pool=label, kind="hard")
+
+    @event.listens_for(pool, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception) -> None:
+        db_pool_invalidations.inc(pool=label, kind="soft")
+
+
+def get_pool_stats(pool: Pool) -> dict:
+    label = getattr(pool, "pool_label", "sync")
+    wait = db_pool_checkout_wait.snapshot(pool=label)
+    return {
+        "pool": label,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": wait["count"],
+        "avg_checkout_wait_seconds": wait["avg"],
+        "checkout_timeouts": db_pool_checkout_timeouts.value(pool=label),
+        "invalidations": db_pool_invalidations.value(pool=label, kind="hard"),
+        "soft_invalidations": db_pool_invalidations.value(pool=label, kind="soft"),
+    }
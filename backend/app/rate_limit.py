@@ -0,0 +1,239 @@
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import case, delete, func
+from .models import ReadRateLimitBucket
+from .metrics import Counter, Gauge
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import AsyncIterator
+from threading import Lock
+from os import getenv
+from . import database
+import itertools
+import hashlib
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = (getenv("RATE_LIMIT_ENABLED") or "true").lower() == "true"
+# "memory" keeps buckets per process at no database cost; "postgres" shares them between workers
+# at one extra connection checkout and commit per check (two per login)
+RATE_LIMIT_BACKEND = (getenv("RATE_LIMIT_BACKEND") or "memory").lower()
+# Reverse proxies in front of the app whose X-Forwarded-For entries are trusted; 0 uses the peer address.
+# Behind a load balancer it must be set (the Dockerfile and vercel.json set 1), or every client shares its address.
+RATE_LIMIT_TRUSTED_PROXIES = int(getenv("RATE_LIMIT_TRUSTED_PROXIES") or 0)
+RATE_LIMIT_MAX_KEYS = int(getenv("RATE_LIMIT_MAX_KEYS") or 100000)
+# Attempts per minute, also the burst allowed after a quiet minute
+AUTH_RATE_LIMIT_PER_IP = int(getenv("AUTH_RATE_LIMIT_PER_IP") or 30)
+AUTH_RATE_LIMIT_PER_EMAIL = int(getenv("AUTH_RATE_LIMIT_PER_EMAIL") or 10)
+# Requests in progress per process on each expensive route group before new ones get 503
+ADMISSION_MAX_CONCURRENCY = int(getenv("ADMISSION_MAX_CONCURRENCY") or 8)
+
+# Postgres buckets idle this long are full again and are deleted
+_PRUNE_IDLE_SECONDS = 3600
+_PRUNE_EVERY = 1000
+# After a shared backend failure, buckets stay in process memory this long before it is tried again
+_BACKEND_RETRY_SECONDS = 30
+_backend_retry_at = 0.0
+_warned_untrusted_forwarding = False
+
+rate_limit_decisions = Counter(
+    "rate_limit_requests_total", "Requests checked against a rate limit, by limit and outcome", ["limit", "result"])
+rate_limit_backend_errors = Counter(
+    "rate_limit_backend_errors_total", "Shared rate limit backend failures answered from process memory instead")
+admission_rejected = Counter(
+    "admission_rejected_total", "Requests turned away because a route group was at its concurrency limit", ["gate"])
+admission_in_flight = Gauge(
+    "admission_in_flight", "Requests in progress per admission controlled route group", ["gate"])
+
+
+class BucketStore(ABC):
+    """Where token buckets live.
+
+    Subclass and assign ``rate_limit.store`` to share buckets some other way (e.g. Redis).
+    ``blocking`` stores are called from the threadpool.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> tuple[bool, float]:
+        """Refill ``key`` at ``rate`` tokens per second up to ``burst`` and remove ``cost`` if enough
+        are left, returning ``(allowed, seconds until it would be)``."""
+
+
+class MemoryBucketStore(BucketStore):
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Evicting the least recently used bucket only forgets a client that has been quiet longest
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class PostgresBucketStore(BucketStore):
+    """Buckets in the rate_limit_buckets table, refilled and taken from in one upsert."""
+
+    blocking = True
+
+    def __init__(self):
+        self._calls = itertools.count(1)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> tuple[bool, float]:
+        table = ReadRateLimitBucket.__table__
+        now = time.time()
+        # In ON CONFLICT DO UPDATE, table.c refers to the existing row
+        refilled = func.least(burst, table.c.tokens + (now - table.c.updated_at) * rate)
+        statement = (
+            insert(table)
+            .values(bucket_key=key, tokens=burst - cost, updated_at=now, allowed=burst >= cost)
+            .on_conflict_do_update(
+                index_elements=[table.c.bucket_key],
+                set_={
+                    "tokens": refilled - case((refilled >= cost, cost), else_=0.0),
+                    "updated_at": now,
+                    "allowed": refilled >= cost,
+                }
+            )
+            .returning(table.c.allowed, table.c.tokens)
+        )
+
+        with database.engine.begin() as connection:
+            allowed, tokens = connection.execute(statement).one()
+            if next(self._calls) % _PRUNE_EVERY == 0:
+                connection.execute(delete(table).where(table.c.updated_at < now - _PRUNE_IDLE_SECONDS))
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+memory_store = MemoryBucketStore()
+store: BucketStore | None = None
+
+
+def get_store() -> BucketStore:
+    global store
+    if store is None:
+        store = PostgresBucketStore() if RATE_LIMIT_BACKEND == "postgres" else memory_store
+    return store
+
+
+def client_ip(request: Request) -> str:
+    global _warned_untrusted_forwarding
+    forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+    if RATE_LIMIT_TRUSTED_PROXIES and len(forwarded) >= RATE_LIMIT_TRUSTED_PROXIES:
+        # The last proxy's peer address is the first entry nobody we trust appended
+        return forwarded[-RATE_LIMIT_TRUSTED_PROXIES]
+    if forwarded and not RATE_LIMIT_TRUSTED_PROXIES and not _warned_untrusted_forwarding:
+        _warned_untrusted_forwarding = True
+        logger.warning("Requests arrive through a proxy but RATE_LIMIT_TRUSTED_PROXIES is 0; "
+                       "all clients behind it share one per-IP rate limit")
+    return request.client.host if request.client else ""
+
+
+class RateLimit:
+    """Token bucket limit of ``per_minute`` requests per key, refilled continuously.
+
+    As a dependency it limits by client IP; ``check`` limits by any other key, such as an email.
+    """
+
+    def __init__(self, name: str, per_minute: int):
+        self.name = name
+        self.per_minute = per_minute
+
+    async def __call__(self, request: Request) -> None:
+        await self.check(client_ip(request))
+
+    async def check(self, value: str) -> None:
+        if not RATE_LIMIT_ENABLED or self.per_minute <= 0 or not value:
+            return
+
+        # Hashed so the shared backend stores neither addresses nor emails
+        key = hashlib.sha256(f"{self.name}:{value.strip().lower()}".encode()).hexdigest()
+        rate, burst = self.per_minute / 60, float(self.per_minute)
+        allowed, retry_after = await self._take(key, rate, burst)
+
+        rate_limit_decisions.inc(limit=self.name, result="allowed" if allowed else "limited")
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(max(math.ceil(retry_after), 1))}
+            )
+
+    async def _take(self, key: str, rate: float, burst: float) -> tuple[bool, float]:
+        global _backend_retry_at
+        bucket_store = get_store()
+        if not bucket_store.blocking:
+            return bucket_store.take(key, rate, burst)
+        if time.monotonic() < _backend_retry_at:
+            return memory_store.take(key, rate, burst)
+
+        try:
+            return await run_in_threadpool(bucket_store.take, key, rate, burst)
+        except Exception:
+            # An unavailable shared backend must not lock everyone out; each worker limits on its own meanwhile
+            logger.warning("Rate limit backend failed, limiting in process memory for %ss", _BACKEND_RETRY_SECONDS, exc_info=True)
+            rate_limit_backend_errors.inc()
+            _backend_retry_at = time.monotonic() + _BACKEND_RETRY_SECONDS
+            return memory_store.take(key, rate, burst)
+
+
+class ConcurrencyLimit:
+    """Dependency capping requests in progress on a route group in this process.
+
+    Over the limit it answers 503 at once instead of letting requests queue for threads and
+    database connections behind the ones already running.
+    """
+
+    def __init__(self, name: str, limit: int = ADMISSION_MAX_CONCURRENCY):
+        self.name = name
+        self.limit = limit
+        self._in_flight = 0
+        self._lock = Lock()
+
+    def _add(self, amount: int) -> None:
+        self._in_flight += amount
+        admission_in_flight.set(self._in_flight, gate=self.name)
+
+    async def __call__(self) -> AsyncIterator[None]:
+        with self._lock:
+            if self.limit > 0 and self._in_flight >= self.limit:
+                admission_rejected.inc(gate=self.name)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please try again shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self._add(1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._add(-1)
+
+
+auth_ip_limit = RateLimit("auth_ip", AUTH_RATE_LIMIT_PER_IP)
+auth_email_limit = RateLimit("auth_email", AUTH_RATE_LIMIT_PER_EMAIL)
+
+bulk_gate = ConcurrencyLimit("bulk")
+search_gate = ConcurrencyLimit("search")
+batch_gate = ConcurrencyLimit("batch")
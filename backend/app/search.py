@@ -0,0 +1,227 @@
+from sqlalchemy import literal, literal_column, text, union_all
+from sqlmodel import Session, select, func
+from .models import ReadProject, ReadTask, SearchResult, SEARCH_VECTOR_COLUMN
+from fastapi import HTTPException, Query, Response, status
+from .pagination import NEXT_CURSOR_HEADER
+from collections import defaultdict
+from threading import Lock
+from typing import Literal
+from os import getenv
+import logging
+import bisect
+import base64
+import json
+import math
+import time
+import re
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAX_TERMS = 16
+# The in-process fallback index (non-Postgres databases) is rebuilt after writes in this process
+# and at least this often, so writes made by other workers show up too
+SEARCH_INDEX_TTL_SECONDS = float(getenv("SEARCH_INDEX_TTL_SECONDS") or 60)
+
+_TOKEN = re.compile(r"[^\W_]+")
+# Matches in a project's name count more than matches in its description, like setweight 'A'/'B'
+_NAME_WEIGHT, _TEXT_WEIGHT = 1.0, 0.4
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+class SearchParams:
+    """``?q=`` plus offset-cursor pagination; ranked results have no stable keyset to page on."""
+
+    def __init__(
+        self,
+        q: str = Query(..., min_length=1, max_length=200),
+        type: Literal["all", "tasks", "projects"] = Query("all"),
+        project_id: int | None = Query(None),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: str | None = Query(None)
+    ):
+        self.terms = list(dict.fromkeys(tokenize(q)))[:SEARCH_MAX_TERMS]
+        self.type = type
+        self.project_id = project_id
+        self.limit = limit
+        self.offset = _decode_offset(cursor) if cursor else 0
+
+    def finalize(self, response: Response, rows: list[SearchResult]) -> list[SearchResult]:
+        if len(rows) <= self.limit:
+            return rows
+        response.headers[NEXT_CURSOR_HEADER] = _encode_offset(self.offset + self.limit)
+        return rows[:self.limit]
+
+
+def _encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([offset]).encode()).decode().rstrip("=")
+
+
+def _decode_offset(cursor: str) -> int:
+    try:
+        (offset,) = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError
+        return offset
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def _postgres_search(session: Session, params: SearchParams) -> list[SearchResult]:
+    # Terms are plain word characters, so they can be joined into a prefix query without escaping
+    query = func.to_tsquery(literal_column("'english'"), " & ".join(f"{term}:*" for term in params.terms))
+    selects = []
+
+    if params.type in ("all", "tasks"):
+        vector = literal_column(f"{ReadTask.__tablename__}.{SEARCH_VECTOR_COLUMN}")
+        statement = select(
+            literal("task").label("type"), ReadTask.task_id.label("id"), ReadTask.task_description.label("title"),
+            ReadTask.project_id.label("project_id"), func.ts_rank(vector, query).label("rank")
+        ).where(vector.op("@@")(query), ReadTask.task_active == True)
+        if params.project_id is not None:
+            statement = statement.where(ReadTask.project_id == params.project_id)
+        selects.append(statement)
+
+    if params.type in ("all", "projects"):
+        vector = literal_column(f"{ReadProject.__tablename__}.{SEARCH_VECTOR_COLUMN}")
+        statement = select(
+            literal("project").label("type"), ReadProject.project_id.label("id"), ReadProject.project_name.label("title"),
+            ReadProject.project_id.label("project_id"), func.ts_rank(vector, query).label("rank")
+        ).where(vector.op("@@")(query), ReadProject.project_active == True)
+        if params.project_id is not None:
+            statement = statement.where(ReadProject.project_id == params.project_id)
+        selects.append(statement)
+
+    results = union_all(*selects).subquery()
+    statement = (
+        select(results)
+        .order_by(results.c.rank.desc(), results.c.type, results.c.id)
+        .offset(params.offset)
+        .limit(params.limit + 1)
+    )
+    return [SearchResult(**row._mapping) for row in session.execute(statement).all()]
+
+
+class InvertedIndex:
+    """In-memory search index over active tasks and projects, for databases without full text search
+    (SQLite in development and tests). Each rebuild reads both tables under the lock."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._built_at: float | None = None
+        self._docs: dict[tuple[str, int], tuple[str, int]] = {}
+        self._postings: dict[str, dict[tuple[str, int], float]] = {}
+        self._tokens: list[str] = []
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    def _stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > SEARCH_INDEX_TTL_SECONDS
+
+    def _build(self, session: Session) -> None:
+        docs, postings = {}, defaultdict(dict)
+
+        def add(key: tuple[str, int], text: str | None, weight: float) -> None:
+            for token in tokenize(text):
+                postings[token][key] = postings[token].get(key, 0.0) + weight
+
+        tasks = select(ReadTask.task_id, ReadTask.task_description, ReadTask.project_id).where(ReadTask.task_active == True)
+        for task_id, description, project_id in session.exec(tasks.execution_options(yield_per=5000)):
+            docs[("task", task_id)] = (description, project_id)
+            add(("task", task_id), description, _NAME_WEIGHT)
+
+        projects = select(ReadProject.project_id, ReadProject.project_name, ReadProject.project_description).where(ReadProject.project_active == True)
+        for project_id, name, description in session.exec(projects):
+            docs[("project", project_id)] = (name, project_id)
+            add(("project", project_id), name, _NAME_WEIGHT)
+            add(("project", project_id), description, _TEXT_WEIGHT)
+
+        self._docs, self._postings, self._tokens = docs, dict(postings), sorted(postings)
+        self._built_at = time.monotonic()
+
+    def _prefix_matches(self, term: str) -> dict[tuple[str, int], float]:
+        matches: dict[tuple[str, int], float] = {}
+        tokens = self._tokens
+        for position in range(bisect.bisect_left(tokens, term), len(tokens)):
+            token = tokens[position]
+            if not token.startswith(term):
+                break
+            for key, weight in self._postings[token].items():
+                matches[key] = matches.get(key, 0.0) + weight
+        return matches
+
+    def search(self, session: Session, params: SearchParams) -> list[SearchResult]:
+        with self._lock:
+            if self._stale():
+                self._build(session)
+            docs, total = self._docs, len(self._docs) or 1
+
+            scores: dict[tuple[str, int], float] | None = None
+            for term in params.terms:
+                matches = self._prefix_matches(term)
+                idf = math.log(1 + total / (len(matches) or 1))
+                if scores is None:
+                    scores = {key: weight * idf for key, weight in matches.items()}
+                else:
+                    # Every term has to match, like the '&' in the Postgres query
+                    scores = {key: score + matches[key] * idf for key, score in scores.items() if key in matches}
+                if not scores:
+                    return []
+
+        kinds = {"all": ("task", "project"), "tasks": ("task",), "projects": ("project",)}[params.type]
+        hits = [
+            (key, score) for key, score in scores.items()
+            if key[0] in kinds and (params.project_id is None or docs[key][1] == params.project_id)
+        ]
+        hits.sort(key=lambda hit: (-hit[1], hit[0][0], hit[0][1]))
+        return [
+            SearchResult(type=kind, id=pk, title=docs[(kind, pk)][0], project_id=docs[(kind, pk)][1], rank=round(score, 6))
+            for (kind, pk), score in hits[params.offset:params.offset + params.limit + 1]
+        ]
+
+
+search_index = InvertedIndex()
+
+# Whether the Postgres tables have their search_vector columns yet. Found once and kept; while
+# missing (databases not yet migrated to 0003) it is checked again every SEARCH_INDEX_TTL_SECONDS.
+_has_search_vectors = False
+_search_vectors_checked_at: float | None = None
+
+
+def search_vectors_available(session: Session) -> bool:
+    global _has_search_vectors, _search_vectors_checked_at
+    if _has_search_vectors:
+        return True
+    if _search_vectors_checked_at is not None and time.monotonic() - _search_vectors_checked_at < SEARCH_INDEX_TTL_SECONDS:
+        return False
+
+    found = session.execute(text(
+        "SELECT count(*) FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name IN (:tasks, :projects) AND column_name = :column"
+    ), {"tasks": ReadTask.__tablename__, "projects": ReadProject.__tablename__, "column": SEARCH_VECTOR_COLUMN}).scalar()
+    _has_search_vectors, _search_vectors_checked_at = found == 2, time.monotonic()
+    if not _has_search_vectors:
+        logger.warning("search_vector columns are missing, /search is unavailable until migration 0003 is applied")
+    return _has_search_vectors
+
+
+def search(session: Session, params: SearchParams) -> list[SearchResult]:
+    if not params.terms:
+        return []
+    if session.get_bind().dialect.name != "postgresql":
+        return search_index.search(session, params)
+    if not search_vectors_available(session):
+        # Not the in-process index: rebuilding it over production tables after every write would queue all searches behind it
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search is unavailable until database migration 0003 is applied"
+        )
+    return _postgres_search(session, params)
+
+
+def invalidate_search_index() -> None:
+    search_index.invalidate()
@@ -0,0 +1,51 @@
+from sqlmodel import Session, select, func, case
+from datetime import date
+from .cache import TTLCache
+from .models import ReadTask
+from os import getenv
+
+# Dashboards tolerate a few seconds of staleness; task writes in this process clear the cache immediately
+stats_cache = TTLCache(maxsize=1024, ttl=float(getenv("STATS_CACHE_TTL_SECONDS") or 15))
+
+
+def _grouped_counts(session: Session, group_col, filters: list, today: date) -> list[dict]:
+    overdue = func.sum(case((ReadTask.task_due_date < today, 1), else_=0))
+    statement = (
+        select(group_col, func.count(), overdue)
+        .where(*filters)
+        .group_by(group_col)
+        .order_by(group_col)
+    )
+    return [
+        {group_col.name: key, "task_count": count, "overdue_count": int(overdue_count or 0)}
+        for key, count, overdue_count in session.exec(statement).all()
+    ]
+
+
+def compute_task_stats(session: Session, project_id: int | None = None) -> dict:
+    today = date.today()
+    filters = [ReadTask.task_active == True]
+    if project_id is not None:
+        filters.append(ReadTask.project_id == project_id)
+
+    by_status = _grouped_counts(session, ReadTask.task_status_id, filters, today)
+    stats = {
+        "project_id": project_id,
+        "as_of": today,
+        "task_count": sum(s["task_count"] for s in by_status),
+        "overdue_count": sum(s["overdue_count"] for s in by_status),
+        "by_status": by_status,
+        "by_owner": _grouped_counts(session, ReadTask.owner_id, filters, today)
+    }
+    if project_id is None:
+        stats["by_project"] = _grouped_counts(session, ReadTask.project_id, filters, today)
+    return stats
+
+
+def get_task_stats(session: Session, project_id: int | None = None) -> dict:
+    return stats_cache.get_or_set(("tasks", project_id, date.today()), lambda: compute_task_stats(session, project_id))
+
+
+def invalidate_task_stats() -> None:
+    # A task update can move it between projects, so every cached view is dropped
+    stats_cache.clear()
@@ -0,0 +1,106 @@
+from .models import FilteredReadUser, JWTPayloadBase, ReadProject, ReadTask, ReadTaskStatus, ReadUser
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, SQLModel, select
+from .utils import check_scopes
+from sqlalchemy import tuple_
+from os import getenv
+import base64
+import json
+
+# modified_on_date is stamped by the server when the row is written (never taken from the client, see
+# utils.stamp_modified), but before commit, so a slow transaction can commit a row older than rows already
+# synced. Rows younger than this are held back until the next sync.
+SYNC_SETTLE_SECONDS = float(getenv("SYNC_SETTLE_SECONDS") or 2)
+
+# name -> (table model, active column, required scope, serializer)
+SYNC_ENTITIES: dict[str, tuple[type[SQLModel], str, str, type[SQLModel]]] = {
+    "tasks": (ReadTask, "task_active", "view_task", ReadTask),
+    "projects": (ReadProject, "project_active", "view_project", ReadProject),
+    "task_statuses": (ReadTaskStatus, "task_status_active", "view_taskstatus", ReadTaskStatus),
+    "users": (ReadUser, "user_active", "view_user", FilteredReadUser),
+}
+
+
+def encode_sync_cursor(marks: dict[str, tuple[datetime, int]]) -> str:
+    raw = json.dumps({name: [ts.isoformat(), pk] for name, (ts, pk) in marks.items()}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> dict[str, tuple[datetime, int]]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return {name: (datetime.fromisoformat(ts), int(pk)) for name, (ts, pk) in raw.items() if name in SYNC_ENTITIES}
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync cursor")
+
+
+def _can_view(jwt_user: JWTPayloadBase, name: str) -> bool:
+    try:
+        check_scopes([SYNC_ENTITIES[name][2]], jwt_user.permission_mask, jwt_user.permission_version)
+    except HTTPException as e:
+        # Out of date tokens still get their 401
+        if e.status_code != status.HTTP_403_FORBIDDEN:
+            raise
+        return False
+    return True
+
+
+def parse_entities(jwt_user: JWTPayloadBase, entities: str | None) -> list[str]:
+    """The requested entities, each of which the token must be able to view, or by default all it can."""
+    if not entities:
+        names = [name for name in SYNC_ENTITIES if _can_view(jwt_user, name)]
+        if not names:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"You do not have access to any of: {list(SYNC_ENTITIES)}"
+            )
+        return names
+    names = list(dict.fromkeys(name.strip() for name in entities.split(",") if name.strip()))
+    unknown = [name for name in names if name not in SYNC_ENTITIES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown entities {unknown}. Allowed: {list(SYNC_ENTITIES)}"
+        )
+    for name in names:
+        check_scopes([SYNC_ENTITIES[name][2]], jwt_user.permission_mask, jwt_user.permission_version)
+    return names
+
+
+def sync_changes(session: Session, jwt_user: JWTPayloadBase, since: str | None, limit: int, entities: str | None) -> dict:
+    """Rows of each entity changed after the cursor, oldest first, with deactivated rows as tombstones.
+
+    Pages are keyed on ``(modified_on_date, primary key)``, matching the composite indexes, so each
+    call reads only the changed rows. ``has_more`` means the client should call again right away.
+    """
+    names = parse_entities(jwt_user, entities)
+
+    marks = decode_sync_cursor(since) if since else {}
+    settled = datetime.now(timezone.utc) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    response, has_more = {}, False
+
+    for name in names:
+        obj, active_name, _, serializer = SYNC_ENTITIES[name]
+        version_col = obj.__table__.c.modified_on_date
+        pk_col = list(obj.__table__.primary_key.columns)[0]
+
+        statement = select(obj).where(version_col <= settled)
+        if name in marks:
+            statement = statement.where(tuple_(version_col, pk_col) > tuple_(*marks[name]))
+        else:
+            # A first sync has nothing to delete, so inactive rows are skipped rather than sent as tombstones
+            statement = statement.where(getattr(obj, active_name) == True)
+        rows = session.exec(statement.order_by(version_col, pk_col).limit(limit + 1)).all()
+
+        if len(rows) > limit:
+            rows, has_more = rows[:limit], True
+        if rows:
+            marks[name] = (rows[-1].modified_on_date, getattr(rows[-1], pk_col.name))
+
+        response[name] = {
+            "upserts": [serializer.model_validate(row, from_attributes=True).model_dump() for row in rows if getattr(row, active_name)],
+            "deleted": [getattr(row, pk_col.name) for row in rows if not getattr(row, active_name)],
+        }
+
+    return {"cursor": encode_sync_cursor(marks), "has_more": has_more, **response}
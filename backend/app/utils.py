@@ -1,14 +1,26 @@
 from fastapi import HTTPException, status, Header, Depends, Cookie, Response
 from jwt import encode, decode, ExpiredSignatureError, InvalidTokenError
-from .models import ReadUser, JWTPayloadBase, JWTPayload
+from .models import ReadProject, ReadRole, ReadRolePermissionLink, ReadRolePermissions, ReadTask, ReadTaskStatus, ReadUser, JWTPayloadBase, JWTPayload
 from datetime import datetime, timedelta, timezone
 from sqlmodel import SQLModel, Session, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import insert, update, values, column, cast
 from fastapi.security import SecurityScopes
-from passlib.context import CryptContext
-from .database import get_session
+from .pagination import PageParams
+from .passwords import hash_password, verify_password, hash_password_async, verify_password_async
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import get_session, get_async_session, commit_or_defer
+from . import database
 from dotenv import load_dotenv
+from .conditional import invalidate_reference_data
+from .stats import invalidate_task_stats
+from .search import invalidate_search_index
+from .events import stage_change_events
+from .permissions import permission_registry, role_permission_names
+from .instrumentation import timed_auth
+from .cache import TTLCache
 from os import getenv
-import ast
+import hmac
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,26 +29,179 @@ JWT_SECRET_KEY = getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = getenv("JWT_ALGORITHM")
 JWT_EXPIRATION_TIME_MINUTES = int(getenv("JWT_EXPIRATION_TIME_MINUTES"))
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS"))
+# Static bearer token for scrapers on the monitoring routes; users need the view_metrics permission instead
+MONITORING_TOKEN = getenv("MONITORING_TOKEN")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# user_id -> modified_on_date, used to reject access tokens issued before a profile/password change
+user_revocation_cache = TTLCache(
+    maxsize=int(getenv("AUTH_CACHE_MAX_USERS") or 10000),
+    ttl=float(getenv("AUTH_CACHE_TTL_SECONDS") or 30)
+)
+
+
+def stamp_modified(obj: type[SQLModel], rows: list[dict], modified_on_date: datetime | None = None) -> None:
+    """Set each row's ``modified_on_date`` to the time of the write, replacing whatever the client sent.
+
+    It is the version sync cursors and ETags move past, so an echo of the copy the client read must never be stored.
+    """
+    if "modified_on_date" in obj.__table__.columns:
+        modified_on_date = modified_on_date or datetime.now(timezone.utc)
+        for row in rows:
+            row["modified_on_date"] = modified_on_date
 
 
 def write_to_db(session: Session, obj: type[SQLModel]) -> dict:
+    if "modified_on_date" in type(obj).__table__.columns:
+        obj.modified_on_date = datetime.now(timezone.utc)
     session.add(obj)
-    session.commit()
+    session.flush()
+    stage_change_events(session, type(obj), "created", [obj.model_dump()])
+    commit_or_defer(session, type(obj))
+    invalidate_caches(type(obj))
     session.refresh(obj)
     return obj.model_dump()
 
 
-def read_from_db(session: Session, obj: type[SQLModel], filters: list | None = None, fetch_first: bool = False) -> list[SQLModel] | SQLModel | None:
+def bulk_write_to_db(session: Session, obj: type[SQLModel], rows: list[tuple[int, dict]]) -> tuple[list[dict], list[dict]]:
+    """Insert ``(index, row)`` pairs with one multi-row INSERT ... RETURNING.
+
+    If the batch violates a constraint it is retried row by row inside savepoints, so one
+    bad row is reported in the errors list instead of aborting the rest of the batch.
+    """
+    pk_col = list(obj.__table__.primary_key.columns)[0]
+    statement = insert(obj).returning(pk_col, sort_by_parameter_order=True)
+    inserted, errors = [], []
+
+    if not rows:
+        return inserted, errors
+
+    # Stamped per batch rather than when each streamed row was validated, which can be long before the commit
+    stamp_modified(obj, [row for _, row in rows])
+    try:
+        with session.begin_nested():
+            ids = session.execute(statement, [row for _, row in rows]).scalars().all()
+        inserted = [{"index": index, pk_col.name: pk} for (index, _), pk in zip(rows, ids)]
+    except DBAPIError:
+        for index, row in rows:
+            try:
+                with session.begin_nested():
+                    pk = session.execute(statement, row).scalar_one()
+                inserted.append({"index": index, pk_col.name: pk})
+            except DBAPIError as e:
+                errors.append({"index": index, "error": str(e.orig).strip()})
+
+    by_index = dict(rows)
+    stage_change_events(session, obj, "created", [{**by_index[row["index"]], pk_col.name: row[pk_col.name]} for row in inserted])
+    commit_or_defer(session, obj)
+    invalidate_caches(obj)
+    return inserted, errors
+
+
+def patch_in_db(session: Session, obj: type[SQLModel], rows: list[tuple[int, dict]], modified_by_email: str) -> tuple[list[dict], list[dict]]:
+    """Apply ``(index, patch)`` pairs, each holding the primary key, the ``modified_on_date`` the client
+    last read and only the columns to change.
+
+    Rows whose version no longer matches are reported as conflicts instead of being overwritten. On
+    Postgres each group of rows changing the same columns is one ``UPDATE ... FROM (VALUES ...)``;
+    other databases, or a group that violates a constraint, fall back to one UPDATE per row. Updated
+    rows report the version as stored, which is what the client must send with its next patch.
+    """
+    table = obj.__table__
+    pk_col = list(table.primary_key.columns)[0]
+    version_col = table.c.modified_on_date
+    # Microseconds are kept so two edits within the same second still produce different versions
+    new_version = datetime.now(timezone.utc)
+    updated, conflicts, groups, seen = [], [], {}, set()
+
+    for index, row in rows:
+        columns = tuple(sorted(key for key in row if key not in (pk_col.name, version_col.name)))
+        if row[pk_col.name] in seen:
+            conflicts.append({"index": index, pk_col.name: row[pk_col.name], "reason": "duplicate"})
+        elif not columns:
+            conflicts.append({"index": index, pk_col.name: row[pk_col.name], "reason": "no_changes"})
+        else:
+            seen.add(row[pk_col.name])
+            groups.setdefault(columns, []).append((index, row))
+
+    audit = {version_col.name: new_version, "modified_by_email": modified_by_email}
+    # pk -> modified_on_date as stored, which can differ from new_version in time zone or precision
+    matched: dict = {}
+    for columns, group in groups.items():
+        batch_matched = None
+        if session.get_bind().dialect.name == "postgresql":
+            source = values(
+                column(pk_col.name, pk_col.type), column("expected_version", version_col.type),
+                *(column(name, table.c[name].type) for name in columns), name="patch"
+            ).data([(row[pk_col.name], row[version_col.name], *(row[name] for name in columns)) for _, row in group])
+            # Untyped VALUES literals default to text, so every column is cast back to the target type
+            statement = (
+                update(table)
+                .where(pk_col == cast(source.c[pk_col.name], pk_col.type),
+                       version_col == cast(source.c.expected_version, version_col.type))
+                .values({name: cast(source.c[name], table.c[name].type) for name in columns} | audit)
+                .returning(pk_col, version_col)
+            )
+            try:
+                with session.begin_nested():
+                    batch_matched = dict(session.execute(statement).all())
+            except DBAPIError:
+                batch_matched = None
+
+        if batch_matched is None:
+            batch_matched = {}
+            for index, row in group:
+                statement = (
+                    update(table)
+                    .where(pk_col == row[pk_col.name], version_col == row[version_col.name])
+                    .values({name: row[name] for name in columns} | audit)
+                    .returning(pk_col, version_col)
+                )
+                try:
+                    with session.begin_nested():
+                        batch_matched.update(session.execute(statement).all())
+                except DBAPIError as e:
+                    conflicts.append({"index": index, pk_col.name: row[pk_col.name], "reason": "invalid", "error": str(e.orig).strip()})
+        matched.update(batch_matched)
+
+    failed = {c["index"] for c in conflicts}
+    missed = [(index, row) for group in groups.values() for index, row in group if row[pk_col.name] not in matched and index not in failed]
+    # Only rows that lost the version check are read back, to tell a stale version from a missing row
+    current = dict(session.execute(
+        select(pk_col, version_col).where(pk_col.in_([row[pk_col.name] for _, row in missed]))
+    ).all()) if missed else {}
+
+    for index, row in missed:
+        if row[pk_col.name] in current:
+            conflicts.append({"index": index, pk_col.name: row[pk_col.name], "reason": "version_mismatch",
+                              "current_modified_on_date": current[row[pk_col.name]]})
+        else:
+            conflicts.append({"index": index, pk_col.name: row[pk_col.name], "reason": "not_found"})
+
+    changed = [row for group in groups.values() for _, row in group if row[pk_col.name] in matched]
+    for group in groups.values():
+        updated += [{"index": index, pk_col.name: row[pk_col.name], version_col.name: matched[row[pk_col.name]]}
+                    for index, row in group if row[pk_col.name] in matched]
+
+    stage_change_events(session, obj, "updated", changed)
+    commit_or_defer(session, obj if updated else None, updated)
+    if updated:
+        invalidate_caches(obj, updated)
+    return updated, conflicts
+
+
+def read_from_db(session: Session, obj: type[SQLModel], filters: list | None = None, fetch_first: bool = False, page: PageParams | None = None, options: list | None = None) -> list[SQLModel] | SQLModel | None:
     statement = select(obj)
     if filters:
         statement = statement.where(*filters)
+    if options:
+        statement = statement.options(*options)
+    if page:
+        statement = page.apply(statement, obj)
     result = session.exec(statement)
     return result.first() if fetch_first else result.all()
 
 
-def update_in_db(session: Session, obj: type[SQLModel], data: list[dict]) -> dict[str, str]:
+def update_in_db(session: Session, obj: type[SQLModel], data: list[dict], modified_on_date: datetime | None = None) -> dict[str, str]:
     pk_col = list(obj.__table__.primary_key.columns)[0]
     pk_name = pk_col.name
 
@@ -47,8 +212,11 @@ def update_in_db(session: Session, obj: type[SQLModel], data: list[dict]) -> dic
             detail=f"Each update entry must include primary key '{pk_name}'. Missing in {len(missing_keys)} record(s)."
         )
 
+    stamp_modified(obj, data, modified_on_date)
     session.bulk_update_mappings(obj, data)
-    session.commit()
+    stage_change_events(session, obj, "updated", data)
+    commit_or_defer(session, obj, data)
+    invalidate_caches(obj, data)
 
     return {
         "status": "success",
@@ -56,12 +224,91 @@ def update_in_db(session: Session, obj: type[SQLModel], data: list[dict]) -> dic
     }
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def async_write_to_db(session: AsyncSession, obj: SQLModel) -> dict:
+    if "modified_on_date" in type(obj).__table__.columns:
+        obj.modified_on_date = datetime.now(timezone.utc)
+    session.add(obj)
+    await session.flush()
+    await session.run_sync(stage_change_events, type(obj), "created", [obj.model_dump()])
+    await session.commit()
+    invalidate_caches(type(obj))
+    await session.refresh(obj)
+    return obj.model_dump()
+
+
+async def async_read_from_db(session: AsyncSession, obj: type[SQLModel], filters: list | None = None, fetch_first: bool = False, page: PageParams | None = None, options: list | None = None) -> list[SQLModel] | SQLModel | None:
+    statement = select(obj)
+    if filters:
+        statement = statement.where(*filters)
+    if options:
+        statement = statement.options(*options)
+    if page:
+        statement = page.apply(statement, obj)
+    result = await session.exec(statement)
+    return result.first() if fetch_first else result.all()
+
+
+async def async_update_in_db(session: AsyncSession, obj: type[SQLModel], data: list[dict], modified_on_date: datetime | None = None) -> dict[str, str]:
+    pk_col = list(obj.__table__.primary_key.columns)[0]
+    pk_name = pk_col.name
+
+    missing_keys = [d for d in data if pk_name not in d]
+    if missing_keys:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Each update entry must include primary key '{pk_name}'. Missing in {len(missing_keys)} record(s)."
+        )
+
+    stamp_modified(obj, data, modified_on_date)
+    await session.run_sync(lambda sync_session: sync_session.bulk_update_mappings(obj, data))
+    await session.run_sync(stage_change_events, obj, "updated", data)
+    await session.commit()
+    invalidate_caches(obj, data)
+
+    return {
+        "status": "success",
+        "message": f"Updated {len(data)} record(s) in '{obj.__tablename__}'."
+    }
+
 
+def invalidate_caches(obj: type[SQLModel], data: list[dict] | None = None) -> None:
+    """Drop in-process cached state derived from ``obj`` rows after a committed write.
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    Inside a batch it runs right after the flush, so later operations read their own writes, and
+    again when the batch ends, since reads in between may have cached state its commit or rollback makes stale.
+    """
+    if obj is ReadUser and data:
+        invalidate_user_auth_cache(*(d["user_id"] for d in data if "user_id" in d))
+    elif obj is ReadTask:
+        invalidate_task_stats()
+    elif obj in (ReadRole, ReadRolePermissions, ReadTaskStatus):
+        invalidate_reference_data()
+    if obj in (ReadRolePermissions, ReadRolePermissionLink):
+        permission_registry.invalidate()
+    if obj in (ReadTask, ReadProject):
+        invalidate_search_index()
+
+
+def invalidate_user_auth_cache(*user_ids: int) -> None:
+    user_revocation_cache.invalidate(*(int(user_id) for user_id in user_ids))
+
+
+def get_user_modified_on_date(session: Session, user_id: int) -> datetime | None:
+    modified_on_date = user_revocation_cache.get(user_id)
+    if modified_on_date is None:
+        modified_on_date = session.exec(select(ReadUser.modified_on_date).where(ReadUser.user_id == user_id)).first()
+        if modified_on_date is not None:
+            user_revocation_cache.set(user_id, modified_on_date)
+    return modified_on_date
+
+
+async def async_get_user_modified_on_date(session: AsyncSession, user_id: int) -> datetime | None:
+    modified_on_date = user_revocation_cache.get(user_id)
+    if modified_on_date is None:
+        modified_on_date = (await session.exec(select(ReadUser.modified_on_date).where(ReadUser.user_id == user_id))).first()
+        if modified_on_date is not None:
+            user_revocation_cache.set(user_id, modified_on_date)
+    return modified_on_date
 
 
 def create_access_token(data: JWTPayloadBase, current_time: datetime | None = None) -> str:
@@ -76,7 +323,7 @@ def create_access_token(data: JWTPayloadBase, current_time: datetime | None = No
     return access_token
 
 
-def create_refresh_token(data: JWTPayloadBase, current_time: datetime | None = None) -> str:
+def create_refresh_token(session: Session, data: JWTPayloadBase, current_time: datetime | None = None) -> str:
     if not current_time:
         current_time = datetime.now(timezone.utc).replace(microsecond=0)
 
@@ -84,12 +331,13 @@ def create_refresh_token(data: JWTPayloadBase, current_time: datetime | None = N
     to_encode = data.model_dump()
     to_encode.update({"iat": int(current_time.timestamp()), "exp": int(expiration_time.timestamp()), "type": "refresh"})
     refresh_token = encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-    update_in_db(next(get_session()), ReadUser, [{"user_id": data.user_id, "refresh_token": refresh_token, "modified_by_email": "system", "modified_on_date": current_time}])
+    # Stamped with the tokens' iat, so the tokens issued with it are not taken as revoked
+    update_in_db(session, ReadUser, [{"user_id": data.user_id, "refresh_token": refresh_token, "modified_by_email": "system"}], current_time)
 
     return refresh_token
 
 
-def verify_access_token(required_scopes: SecurityScopes, authorization: str = Header(...), session: Session = Depends(get_session)) -> JWTPayloadBase:
+def decode_access_token(authorization: str) -> JWTPayload:
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid authorization header")
 
@@ -97,45 +345,88 @@ def verify_access_token(required_scopes: SecurityScopes, authorization: str = He
 
     try:
         decoded_data: dict = decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        payload = JWTPayload(**decoded_data)
+    except ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-        if payload.type != "access":
-            raise HTTPException(status_code=401, detail="Invalid token type for access")
+    payload = JWTPayload(**decoded_data)
 
-        iat = datetime.fromtimestamp(payload.iat, tz=timezone.utc)
-        user = session.get(ReadUser, int(payload.user_id))
+    if payload.type != "access":
+        raise HTTPException(status_code=401, detail="Invalid token type for access")
 
-        if user.modified_on_date.astimezone(timezone(timedelta(hours=5, minutes=30))) > iat:
-            raise HTTPException(status_code=401, detail="Access token revoked due to profile/password update")
+    return payload
 
-        scopes = list(required_scopes.scopes) # Using list make a copy
-        mode = "any"
-        if scopes and scopes[0].startswith("all:"):
-            mode = "all"
-            scopes[0] = scopes[0].replace("all:", "")
 
-        if scopes:
-            user_scopes: list[str] = ast.literal_eval(payload.role_permissions or "[]")
+def check_scopes(required_scopes: list[str], permission_mask: int | None, permission_version: str | None) -> None:
+    scopes = list(required_scopes) # Using list make a copy
+    mode = "any"
+    if scopes and scopes[0].startswith("all:"):
+        mode = "all"
+        scopes[0] = scopes[0].replace("all:", "")
 
-            if mode == "any" and not any(scope in user_scopes for scope in scopes):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"You do not have access to this resource. Requires one of: {scopes}"
-                )
-            elif mode == "all" and not all(scope in user_scopes for scope in scopes):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"You do not have access to this resource. Requires all of: {scopes}"
-                )
+    if scopes:
+        compiled = permission_registry.current(permission_version)
+        if permission_mask is None or compiled.version != permission_version:
+            # Issued before the claims or against permissions since added or removed; a refresh reissues it
+            raise HTTPException(status_code=401, detail="Token permissions are out of date")
+        allowed = compiled.allows(permission_mask, tuple(scopes), mode == "all")
 
-        return JWTPayloadBase(**payload.model_dump())
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+        if not allowed and mode == "any":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"You do not have access to this resource. Requires one of: {scopes}"
+            )
+        elif not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"You do not have access to this resource. Requires all of: {scopes}"
+            )
+
+
+def authorize_access_token(payload: JWTPayload, modified_on_date: datetime | None, required_scopes: SecurityScopes) -> JWTPayloadBase:
+    if modified_on_date is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    iat = datetime.fromtimestamp(payload.iat, tz=timezone.utc)
+    if modified_on_date.astimezone(timezone(timedelta(hours=5, minutes=30))) > iat:
+        raise HTTPException(status_code=401, detail="Access token revoked due to profile/password update")
 
+    check_scopes(required_scopes.scopes, payload.permission_mask, payload.permission_version)
+    return JWTPayloadBase(**payload.model_dump())
 
-def refresh_token(refresh_token: str = Cookie(...), session: Session = Depends(get_session)) -> dict[str, str]:
+
+def authenticate_access_token(authorization: str, scopes: list[str]) -> JWTPayloadBase:
+    """verify_access_token for callers outside dependency injection, such as WebSockets."""
+    with timed_auth():
+        payload = decode_access_token(authorization)
+        with database.SessionLocal() as session:
+            modified_on_date = get_user_modified_on_date(session, int(payload.user_id))
+        return authorize_access_token(payload, modified_on_date, SecurityScopes(scopes))
+
+
+def verify_access_token(required_scopes: SecurityScopes, authorization: str = Header(...), session: Session = Depends(get_session)) -> JWTPayloadBase:
+    with timed_auth():
+        payload = decode_access_token(authorization)
+        modified_on_date = get_user_modified_on_date(session, int(payload.user_id))
+        return authorize_access_token(payload, modified_on_date, required_scopes)
+
+
+async def verify_access_token_async(required_scopes: SecurityScopes, authorization: str = Header(...), session: AsyncSession = Depends(get_async_session)) -> JWTPayloadBase:
+    with timed_auth():
+        payload = decode_access_token(authorization)
+        modified_on_date = await async_get_user_modified_on_date(session, int(payload.user_id))
+        return authorize_access_token(payload, modified_on_date, required_scopes)
+
+
+def verify_monitoring_access(authorization: str = Header(...), session: Session = Depends(get_session)) -> None:
+    """Guard for the monitoring routes, which expose pool sizes, route names and auth timings."""
+    if MONITORING_TOKEN and hmac.compare_digest(authorization.encode(), f"Bearer {MONITORING_TOKEN}".encode()):
+        return
+    verify_access_token(SecurityScopes(["view_metrics"]), authorization, session)
+
+
+def refresh_token(refresh_token: str = Cookie(...), session: Session = Depends(get_session)) -> dict[str, str | list[str]]:
     if not refresh_token:
         raise HTTPException(status_code=401, detail="No refresh token provided")
 
@@ -156,33 +447,41 @@ def refresh_token(refresh_token: str = Cookie(...), session: Session = Depends(g
     if (user.modified_on_date.replace(tzinfo=timezone.utc) > iat) or (user.refresh_token != refresh_token):
         raise HTTPException(status_code=401, detail="Refresh token revoked due to profile/password update")
 
+    # Compiled from the role's current link rows, so role changes apply from the next refresh
+    permissions = role_permission_names(session, user.role_id)
     token_data = JWTPayloadBase(
         user_id=payload.user_id,
         first_name=payload.first_name,
         last_name=payload.last_name,
         email=payload.email,
         role_name=payload.role_name,
-        role_permissions=payload.role_permissions
+        **permission_registry.claims(session, permissions)
     )
     new_access_token = create_access_token(token_data)
 
-    return {"access_token": new_access_token}
+    return {"access_token": new_access_token, "permissions": permissions}
 
 
-def issue_tokens_and_set_cookie(response: Response, db_user: ReadUser, role_name: str, role_permissions: str) -> str:
+def issue_tokens_and_set_cookie(response: Response, session: Session, db_user: ReadUser, role_name: str) -> dict[str, str | list[str]]:
+    """Issue access and refresh tokens for ``db_user`` and return the login response body.
+
+    Tokens carry the role's permissions only as a bitmask; the names are returned alongside for the client.
+    """
+    permissions = role_permission_names(session, db_user.role_id)
     token_data = JWTPayloadBase(
         user_id=db_user.user_id,
         first_name=db_user.first_name,
         last_name=db_user.last_name,
         email=db_user.email,
         role_name=role_name,
-        role_permissions=role_permissions
+        **permission_registry.claims(session, permissions)
     )
 
     current_time = datetime.now(timezone.utc).replace(microsecond=0)
 
     access_token = create_access_token(token_data, current_time)
-    refresh_token_cookie = create_refresh_token(token_data, current_time)
+    # Persisted with the caller's session so the login's lookup and token write share one transaction
+    refresh_token_cookie = create_refresh_token(session, token_data, current_time)
 
     response.set_cookie(
         key="refresh_token",
@@ -193,4 +492,4 @@ def issue_tokens_and_set_cookie(response: Response, db_user: ReadUser, role_name
         max_age=int(JWT_REFRESH_TOKEN_EXPIRE_DAYS) * 24 * 60 * 60
     )
 
-    return access_token
+    return {"access_token": access_token, "permissions": permissions}
@@ -0,0 +1,193 @@
+"""Load test the main API paths at a fixed concurrency.
+
+Seeds a database through the models, then drives the real FastAPI app through an
+in-process ASGI client with ``--concurrency`` workers per scenario and reports
+p50/p95/p99 latency and throughput as JSON. Save a run with ``--output`` and pass
+it to a later run with ``--compare`` to see the change per scenario.
+
+    cd backend && pip install -r requirements-bench.txt
+    cd backend && python -m benchmarks.api_load --tasks 20000 --output before.json
+    cd backend && python -m benchmarks.api_load --tasks 20000 --compare before.json
+"""
+from benchmarks.common import BENCH_PASSWORD, auth_headers, create_benchmark_engine, seed, use_engine
+from app.passwords import shutdown_password_executor
+from datetime import date, datetime, timezone
+from time import perf_counter
+from app.main import app
+import subprocess
+import argparse
+import asyncio
+import platform
+import random
+import httpx
+import json
+import math
+
+SCENARIOS = ["login", "list_tasks", "get_task", "update_task", "bulk_tasks"]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Scenario:
+    def __init__(self, args: argparse.Namespace, headers: dict[str, str]):
+        self.args = args
+        self.headers = headers
+        self.rng = random.Random(args.seed)
+
+    def login(self) -> tuple[str, str, dict]:
+        # User 1 holds the bearer token for the other scenarios, and logging in would revoke it
+        user_id = self.rng.randint(2, self.args.users)
+        return "POST", "/api/login", {"json": {"email": f"user{user_id}@bench.local", "plain_password": BENCH_PASSWORD}}
+
+    def list_tasks(self) -> tuple[str, str, dict]:
+        return "GET", "/api/tasks", {"headers": self.headers, "params": {"limit": self.args.page_size}}
+
+    def get_task(self) -> tuple[str, str, dict]:
+        return "GET", f"/api/tasks/{self.rng.randint(1, self.args.tasks)}", {"headers": self.headers}
+
+    def update_task(self) -> tuple[str, str, dict]:
+        task_id = self.rng.randint(1, self.args.tasks)
+        body = {
+            "task_id": task_id, "task_description": f"Updated task {task_id}",
+            "task_status_id": self.rng.randint(1, 4), "owner_id": 1 + task_id % self.args.users,
+            "project_id": 1 + task_id % self.args.projects, "task_active": True, "modified_by_email": "bench",
+        }
+        return "POST", "/api/update_task", {"headers": self.headers, "json": body}
+
+    def bulk_tasks(self) -> tuple[str, str, dict]:
+        rows = [
+            {"task_description": f"Bulk task {i}", "task_due_date": date(2024, 6, 1).isoformat(),
+             "task_status_id": 1 + i % 4, "owner_id": 1 + i % self.args.users, "project_id": 1 + i % self.args.projects}
+            for i in range(self.args.bulk_rows)
+        ]
+        content = "\n".join(json.dumps(row) for row in rows)
+        return "POST", "/api/tasks/bulk", {"headers": {**self.headers, "Content-Type": "application/x-ndjson"}, "content": content}
+
+
+async def run_scenario(client: httpx.AsyncClient, build, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = build()
+            start = perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(perf_counter() - start)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    deltas = {}
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        deltas[name] = {
+            key: f"{(result[key] - previous[key]) / previous[key] * 100:+.1f}%"
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms") if previous.get(key)
+        }
+    return deltas
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scenario = Scenario(args, auth_headers())
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in args.scenarios:
+            build = getattr(scenario, name)
+            # login is dominated by bcrypt, so it gets fewer requests than the database paths
+            requests = args.login_requests if name == "login" else args.requests
+            await run_scenario(client, build, min(args.warmup, requests), args.concurrency)
+            results[name] = await run_scenario(client, build, requests, args.concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=100, help="Measured requests for the login scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each scenario")
+    parser.add_argument("--page-size", type=int, default=50, help="limit used by list_tasks")
+    parser.add_argument("--bulk-rows", type=int, default=100, help="Rows per bulk_tasks request")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for ids picked by the scenarios")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=SCENARIOS,
+                        help=f"Comma separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--output", help="Write the JSON result to this file as well as stdout")
+    parser.add_argument("--compare", help="Previous --output file to compare against")
+    args = parser.parse_args()
+    if args.users < 2:
+        parser.error("--users must be at least 2")
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s) {unknown}")
+
+    engine = create_benchmark_engine()
+    seed(engine, users=args.users, projects=args.projects, tasks=args.tasks)
+    use_engine(app, engine)
+
+    try:
+        scenarios = asyncio.run(run(args))
+    finally:
+        shutdown_password_executor()
+
+    result = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scenarios": scenarios,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            result["compare"] = {"baseline_commit": (baseline := json.load(f)).get("commit"), "deltas": compare(result, baseline)}
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
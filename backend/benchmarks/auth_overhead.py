@@ -0,0 +1,65 @@
+"""Measure authorization against the compiled permission bitmask.
+
+Times check_scopes and the full token path (decode + authorize), then one
+authenticated endpoint end to end, and compares the size of the issued token
+with the same token carrying the role_permissions string it used to.
+
+    cd backend && python -m benchmarks.auth_overhead
+"""
+from benchmarks.common import PERMISSIONS, auth_headers, create_benchmark_engine, seed, use_engine
+from app.utils import JWT_ALGORITHM, JWT_SECRET_KEY, authorize_access_token, check_scopes, decode_access_token
+from app.permissions import migrate_role_permissions
+from fastapi.security import SecurityScopes
+from fastapi.testclient import TestClient
+from time import perf_counter
+from datetime import datetime
+from app.main import app
+from jwt import decode, encode
+import json
+import os
+
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS") or 200000)
+REQUESTS = int(os.getenv("BENCH_REQUESTS") or 1000)
+SCOPES = ["view_project", "view_task"]
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round((perf_counter() - start) / iterations * 1e6, 3)
+
+
+def main() -> None:
+    engine = create_benchmark_engine()
+    seed(engine, users=10, projects=10, tasks=100)
+    use_engine(app, engine)
+    print(json.dumps({"migration": migrate_role_permissions(engine)}))
+
+    headers = auth_headers()
+    token = headers["Authorization"]
+    payload = decode_access_token(token)
+    mask, version = payload.permission_mask, payload.permission_version
+    scopes = SecurityScopes(SCOPES)
+    modified_on_date = datetime(2020, 1, 1)
+
+    results = {
+        "check_scopes_us": _per_call_us(lambda: check_scopes(SCOPES, mask, version), ITERATIONS),
+        "decode_and_authorize_us": _per_call_us(lambda: authorize_access_token(decode_access_token(token), modified_on_date, scopes), ITERATIONS // 10),
+    }
+
+    with TestClient(app) as client:
+        client.get("/api/tasks/1", headers=headers)
+        start = perf_counter()
+        for _ in range(REQUESTS):
+            client.get("/api/tasks/1", headers=headers).raise_for_status()
+        results["get_task_ms"] = round((perf_counter() - start) / REQUESTS * 1000, 4)
+
+    claims = decode(token.removeprefix("Bearer "), JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    with_string = encode({**claims, "role_permissions": str(PERMISSIONS)}, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    token_bytes = {"bitmask": len(token.removeprefix("Bearer ")), "with_role_permissions": len(with_string)}
+    print(json.dumps({"permissions": len(PERMISSIONS), "token_bytes": token_bytes, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare a board drag-and-drop made of separate requests with the same operations in one /batch.
+
+Each move patches a task into the next status and re-fetches the first page of that status
+column, as the board does. "sequential" sends them as separate requests, "batch" as one POST
+/batch. Reports time per move, requests, token verifications and commits per move. Requests go
+through the in-process test client, so network round trips (one per request) come on top:
+--rtt-ms adds them to the totals for comparison.
+
+    cd backend && python -m benchmarks.batch --moves 200 --rtt-ms 40
+"""
+from benchmarks.common import TASK_STATUSES, auth_headers, create_benchmark_engine, seed, use_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from time import perf_counter
+from app.models import ReadTask
+from app.main import app
+from app import utils
+import argparse
+import json
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--moves", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Network round trip added per request")
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=20, projects=20, tasks=args.tasks)
+    session_factory = use_engine(app, engine)
+    headers = auth_headers()
+
+    counts = {"commits": 0, "verifications": 0}
+    event.listen(engine, "commit", lambda connection: counts.__setitem__("commits", counts["commits"] + 1))
+    verify = utils.decode_access_token
+
+    def counted_decode(authorization: str):
+        counts["verifications"] += 1
+        return verify(authorization)
+
+    utils.decode_access_token = counted_decode
+
+    def operations(task_id: int) -> list[dict]:
+        # Read directly, so only the move itself is timed and counted
+        with session_factory() as session:
+            task = session.get(ReadTask, task_id)
+        next_status = 1 + task.task_status_id % len(TASK_STATUSES)
+        return [
+            {"method": "PATCH", "path": "/tasks", "body": [{"task_id": task_id, "modified_on_date": task.modified_on_date.isoformat(), "task_status_id": next_status}]},
+            {"method": "GET", "path": f"/projects/{task.project_id}/tasks?task_status_id={next_status}&limit=50"},
+        ]
+
+    def sequential(client: TestClient, ops: list[dict]) -> int:
+        for op in ops:
+            client.request(op["method"], f"/api{op['path']}", json=op.get("body"), headers=headers).raise_for_status()
+        return len(ops)
+
+    def batched(client: TestClient, ops: list[dict]) -> int:
+        response = client.post("/api/batch", json=ops, headers=headers)
+        if not response.json()["committed"]:
+            raise SystemExit(f"batch failed: {response.text}")
+        return 1
+
+    results = {}
+    with TestClient(app) as client:
+        for name, run in (("sequential", sequential), ("batch", batched)):
+            elapsed, requests = 0.0, 0
+            counts.update(commits=0, verifications=0)
+            for move in range(args.moves):
+                ops = operations(1 + move)
+                start = perf_counter()
+                requests += run(client, ops)
+                elapsed += perf_counter() - start
+            results[name] = {
+                "per_move_ms": round(elapsed / args.moves * 1000, 2),
+                "requests_per_move": requests / args.moves,
+                "with_rtt_ms": round(elapsed / args.moves * 1000 + requests / args.moves * args.rtt_ms, 2),
+                "token_verifications_per_move": counts["verifications"] / args.moves,
+                "commits_per_move": counts["commits"] / args.moves,
+            }
+    utils.decode_access_token = verify
+
+    print(json.dumps({"tasks": args.tasks, "moves": args.moves, "rtt_ms": args.rtt_ms, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
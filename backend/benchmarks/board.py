@@ -0,0 +1,54 @@
+"""Compare loading a project's board with downloading all of its tasks.
+
+"full" is what the board screen used to need: every task of the project from
+/projects/{id}/tasks plus /taskstatus, grouped in the client. "board" is
+/projects/{id}/board, which returns the first --limit tasks of every status column and
+their totals in one query. Also times one "load more" of a column.
+
+    cd backend && python -m benchmarks.board --tasks 50000 --projects 5
+"""
+from benchmarks.common import auth_headers, create_benchmark_engine, seed, use_engine
+from benchmarks.json_serialization import measure
+from fastapi.testclient import TestClient
+from app.main import app
+import argparse
+import json
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20, help="Tasks per board column")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed requests per path; the best is reported")
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=20, projects=args.projects, tasks=args.tasks)
+    use_engine(app, engine)
+    headers = auth_headers()
+
+    with TestClient(app) as client:
+        board = client.get(f"/api/projects/1/board?limit={args.limit}", headers=headers).json()
+        column = next(column for column in board["columns"] if column["next_cursor"])
+        more = f"/api/projects/1/board?limit={args.limit}&task_status_id={column['task_status_id']}&cursor={column['next_cursor']}"
+
+        tasks = measure(client, "/api/projects/1/tasks", headers, args.repeat)
+        statuses = measure(client, "/api/taskstatus", headers, args.repeat)
+        results = {
+            "full": {key: round(tasks[key] + statuses[key], 2) for key in ("best_ms", "cpu_ms", "bytes")},
+            "board": measure(client, f"/api/projects/1/board?limit={args.limit}", headers, args.repeat),
+            "load_more": measure(client, more, headers, args.repeat),
+        }
+    results["speedup"] = round(results["full"]["best_ms"] / results["board"]["best_ms"], 2)
+
+    print(json.dumps({
+        "tasks_in_project": sum(column["total"] for column in board["columns"]),
+        "columns": len(board["columns"]),
+        "limit": args.limit,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
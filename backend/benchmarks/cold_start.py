@@ -0,0 +1,127 @@
+"""Measure cold starts: a fresh interpreter importing app.main and serving its first request.
+
+Each run starts a new Python process, the way a serverless function instance does. The
+process times ``import app.main``, the ASGI lifespan startup uvicorn runs before accepting
+connections, and one GET /api/health sent straight to the ASGI app, then reports its peak RSS
+and which heavy optional modules ended up loaded. Prints medians over
+``--runs`` as JSON; ``--output``/``--compare`` work like benchmarks.api_load.
+
+    cd backend && python -m benchmarks.cold_start --runs 10 --output before.json
+    cd backend && python -m benchmarks.cold_start --runs 10 --compare before.json
+"""
+import benchmarks.common  # noqa: F401  sets the environment variables the app reads at import
+from time import perf_counter
+import statistics
+import subprocess
+import argparse
+import json
+import sys
+import os
+
+HEAVY_MODULES = ["google.auth", "google.oauth2", "requests", "passlib.context", "psycopg2", "pandas"]
+
+CHILD = """
+import time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+import asyncio, json, resource, sys
+
+async def startup():
+    # What uvicorn does before accepting connections; the app's lifespan runs here
+    events, replies = asyncio.Queue(), asyncio.Queue()
+    await events.put({"type": "lifespan.startup"})
+    lifespan = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, events.get, replies.put))
+    reply = await replies.get()
+    if reply["type"] != "lifespan.startup.complete":
+        raise SystemExit(reply)
+    return events, replies, lifespan
+
+async def shutdown(events, replies, lifespan):
+    await events.put({"type": "lifespan.shutdown"})
+    await replies.get()
+    await lifespan
+
+async def first_request():
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/api/health", "raw_path": b"/api/health", "query_string": b"", "root_path": "",
+             "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+async def main():
+    global started, done
+    lifespan = await startup()
+    started = time.perf_counter()
+    status = await first_request()
+    done = time.perf_counter()
+    await shutdown(*lifespan)
+    return status
+
+status = asyncio.run(main())
+print(json.dumps({
+    "status": status,
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "first_request_ms": (done - started) * 1000,
+    "max_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once() -> dict:
+    start = perf_counter()
+    completed = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, env=os.environ,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    elapsed = perf_counter() - start
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = elapsed * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON result to this file as well as stdout")
+    parser.add_argument("--compare", help="Previous --output file to compare against")
+    args = parser.parse_args()
+
+    # One unmeasured run so every measured one finds the .pyc files already written
+    run_once()
+    runs = [run_once() for _ in range(args.runs)]
+
+    keys = ("import_ms", "startup_ms", "first_request_ms", "process_ms", "max_rss_mib")
+    result = {
+        "runs": args.runs,
+        "median": {key: round(statistics.median(run[key] for run in runs), 2) for key in keys},
+        "min": {key: round(min(run[key] for run in runs), 2) for key in keys},
+        "loaded_modules": runs[-1]["loaded"],
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        result["compare"] = {
+            key: f"{(result['median'][key] - baseline['median'][key]) / baseline['median'][key] * 100:+.1f}%"
+            for key in keys if baseline.get("median", {}).get(key)
+        }
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
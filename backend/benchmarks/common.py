@@ -0,0 +1,128 @@
+"""Shared setup for the backend benchmarks.
+
+Benchmarks run against the real FastAPI app with ``get_session`` pointed at a local
+database (a throwaway SQLite file unless BENCH_DATABASE_URL is set), so they need no
+Postgres or .env. Import this module before anything from ``app``. The test clients
+need httpx, installed with ``pip install -r requirements-bench.txt``.
+"""
+from datetime import date, datetime, timedelta, timezone
+import tempfile
+import os
+
+# The app reads these at import time; benchmarks must not depend on a real .env
+for _key, _value in {
+    "JWT_SECRET_KEY": "benchmark-secret-key-with-enough-length",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRATION_TIME_MINUTES": "60",
+    "JWT_REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "benchmark",
+    "DB_SCHEMA": "public",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    # Limits stay on so their cost is measured, but all load comes from the one test client
+    # address, so they are set too high to turn it away; benchmarks.rate_limit sets real ones
+    "AUTH_RATE_LIMIT_PER_IP": "1000000",
+    "AUTH_RATE_LIMIT_PER_EMAIL": "1000000",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.models import ReadProject, ReadRole, ReadRolePermissions, ReadTask, ReadTaskStatus, ReadUser, JWTPayloadBase
+from app.pool_metrics import InstrumentedQueuePool, instrument_pool_events
+from app.permissions import CompiledPermissions, sync_role_permission_links
+from app.utils import create_access_token, hash_password
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine
+from app import database
+
+BENCH_PASSWORD = "benchmark-password"
+PERMISSIONS = [
+    "view_user", "update_user", "create_role", "view_role", "update_role",
+    "create_project", "view_project", "update_project",
+    "create_task", "view_task", "update_task", "update_taskstatus_in_task",
+    "create_taskstatus", "view_taskstatus", "update_taskstatus",
+]
+TASK_STATUSES = ["To Do", "In Progress", "Review", "Done"]
+
+
+def create_benchmark_engine(url: str | None = None) -> Engine:
+    url = url or os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkstemp(suffix='.db')[1]}"
+
+    if url.startswith("sqlite"):
+        engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=5, max_overflow=10,
+                               connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=10, max_overflow=20)
+
+    instrument_pool_events(engine.pool)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def use_engine(app, engine: Engine) -> sessionmaker:
+    """Point the app's sessions (dependency and direct SessionLocal users) at ``engine``."""
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
+
+    def get_benchmark_session():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    database.engine = engine
+    database.SessionLocal = session_factory
+    app.dependency_overrides[database.get_session] = get_benchmark_session
+    return session_factory
+
+
+def seed(engine: Engine, users: int = 10, projects: int = 10, tasks: int = 1000, batch_size: int = 5000) -> None:
+    # Backdated so tokens issued during the run are not treated as revoked
+    past = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    hashed_password = hash_password(BENCH_PASSWORD)
+
+    with Session(engine) as session:
+        session.add_all(ReadRolePermissions(role_permissions_name=name) for name in PERMISSIONS)
+        session.add(ReadRole(role_name="admin", role_permissions=str(PERMISSIONS), modified_on_date=past))
+        session.add_all(ReadTaskStatus(task_status_name=name, modified_on_date=past) for name in TASK_STATUSES)
+        session.commit()
+        sync_role_permission_links(session)
+
+        session.add_all(
+            ReadUser(first_name=f"User{i}", last_name="Bench", email=f"user{i}@bench.local", provider="local",
+                     role_id=1, hashed_password=hashed_password, refresh_token=None, modified_on_date=past)
+            for i in range(1, users + 1)
+        )
+        session.commit()
+
+        session.add_all(
+            ReadProject(project_name=f"Project {i}", project_description=f"Benchmark project {i}",
+                        project_start_date=date(2024, 1, 1), project_end_date=date(2024, 12, 31),
+                        owner_id=1 + i % users, modified_on_date=past + timedelta(minutes=i))
+            for i in range(1, projects + 1)
+        )
+        session.commit()
+
+        for start in range(0, tasks, batch_size):
+            session.add_all(
+                ReadTask(task_description=f"Task {i} for project {1 + i % projects}",
+                         task_due_date=date(2024, 1, 1) + timedelta(days=i % 365),
+                         task_status_id=1 + i % len(TASK_STATUSES), owner_id=1 + i % users,
+                         project_id=1 + i % projects, modified_on_date=past + timedelta(seconds=i))
+                for i in range(start, min(start + batch_size, tasks))
+            )
+            session.commit()
+
+
+def auth_headers(user_id: int = 1) -> dict[str, str]:
+    # The seeded permissions are exactly PERMISSIONS, so these are the claims login would issue
+    compiled = CompiledPermissions(PERMISSIONS)
+    token = create_access_token(JWTPayloadBase(
+        user_id=user_id, first_name=f"User{user_id}", last_name="Bench", email=f"user{user_id}@bench.local",
+        role_name="admin", permission_mask=compiled.mask(PERMISSIONS), permission_version=compiled.version
+    ))
+    return {"Authorization": f"Bearer {token}"}
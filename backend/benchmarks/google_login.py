@@ -0,0 +1,73 @@
+"""Compare Google ID token verification with and without the key and claims caches.
+
+Runs fully offline against benchmarks.google_stub. "uncached" is what /login/google used to
+do: a new HTTP session and a certificate download per login. The others go through
+app.google_auth. The stub is on localhost, so against the real endpoint the uncached path
+also pays a TLS handshake and an internet round trip per login.
+
+    cd backend && python -m benchmarks.google_login
+"""
+from benchmarks.common import create_benchmark_engine, seed, use_engine
+from benchmarks.google_stub import GoogleCertsStub
+from google.auth.transport.requests import Request
+from fastapi.testclient import TestClient
+from google.oauth2 import id_token
+from app.passwords import shutdown_password_executor
+from time import perf_counter
+from app.main import app
+from app import google_auth
+import argparse
+import json
+
+CLIENT_ID = "bench-client-id.apps.googleusercontent.com"
+
+
+def timed(stub: GoogleCertsStub, fn, tokens: list[str]) -> dict:
+    fetches = stub.fetches
+    start = perf_counter()
+    for token in tokens:
+        fn(token)
+    elapsed = perf_counter() - start
+    return {"per_call_ms": round(elapsed / len(tokens) * 1000, 3), "certs_fetches": stub.fetches - fetches}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=10, projects=1, tasks=1)
+    use_engine(app, engine)
+
+    with GoogleCertsStub(max_age=3600) as stub:
+        google_auth.GOOGLE_CERTS_URL, google_auth.GOOGLE_CLIENT_ID = stub.url, CLIENT_ID
+
+        def fresh_tokens() -> list[str]:
+            return [stub.issue(f"user{1 + i % 10}@bench.local", CLIENT_ID) for i in range(args.logins)]
+
+        def uncached(token: str) -> dict:
+            return id_token.verify_token(token, Request(), audience=CLIENT_ID, certs_url=stub.url)
+
+        results = {
+            "uncached": timed(stub, uncached, fresh_tokens()),
+            # Different token per login: keys come from the cache, every token is verified
+            "cached_keys": timed(stub, google_auth.verify_google_id_token, fresh_tokens()),
+            # The same token again, as when the frontend retries a sign-in
+            "cached_claims": timed(stub, google_auth.verify_google_id_token, [stub.issue("user1@bench.local", CLIENT_ID)] * args.logins),
+        }
+
+        with TestClient(app) as client:
+            def login(token: str) -> None:
+                response = client.post("/api/login/google", json={"token": token})
+                if "access_token" not in response.json():
+                    raise SystemExit(f"login failed: {response.text}")
+
+            results["login_endpoint"] = timed(stub, login, fresh_tokens())
+
+    shutdown_password_executor()
+    print(json.dumps({"logins": args.logins, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
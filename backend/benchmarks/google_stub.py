@@ -0,0 +1,64 @@
+"""Local stand-in for Google's ID token signing keys, for offline tests and benchmarks.
+
+Serves ``{key id: public key PEM}`` like https://www.googleapis.com/oauth2/v1/certs, with a
+configurable Cache-Control max-age, counts how often it is fetched, and signs ID tokens that
+verify against it. Point the app at it with ``GOOGLE_CERTS_URL`` (or by assigning
+``app.google_auth.GOOGLE_CERTS_URL``).
+
+    with GoogleCertsStub(max_age=3600) as stub:
+        token = stub.issue(email="user1@bench.local", audience="client-id")
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from google.auth import crypt, jwt
+from threading import Thread
+import itertools
+import json
+import time
+import rsa
+
+
+class GoogleCertsStub:
+    def __init__(self, max_age: int = 3600, key_id: str = "bench-key"):
+        public_key, private_key = rsa.newkeys(2048)
+        self.key_id = key_id
+        self.max_age = max_age
+        self.fetches = 0
+        self._signer = crypt.RSASigner.from_string(private_key.save_pkcs1(), key_id=key_id)
+        self._body = json.dumps({key_id: public_key.save_pkcs1().decode()}).encode()
+        self._nonce = itertools.count()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                stub.fetches += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}, must-revalidate, no-transform")
+                self.send_header("Content-Length", str(len(stub._body)))
+                self.end_headers()
+                self.wfile.write(stub._body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/oauth2/v1/certs"
+
+    def __enter__(self) -> "GoogleCertsStub":
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def issue(self, email: str, audience: str, lifetime: int = 3600, **claims) -> str:
+        """A signed ID token; every call returns a different token, like separate sign-ins."""
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com", "aud": audience, "sub": email, "email": email,
+            "given_name": "Bench", "family_name": "User", "iat": now, "exp": now + lifetime,
+            "jti": str(next(self._nonce)), **claims,
+        }
+        return jwt.encode(self._signer, payload).decode()
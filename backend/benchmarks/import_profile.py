@@ -0,0 +1,67 @@
+"""Report what importing the app costs, per module and per top-level package.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and summarizes
+the result: the slowest modules by cumulative and by self time, and self time summed per
+top-level package (so e.g. everything under ``google`` shows up as one line).
+
+    cd backend && python -m benchmarks.import_profile
+    cd backend && python -m benchmarks.import_profile --module app.api --top 30
+"""
+import benchmarks.common  # noqa: F401  sets the environment variables the app reads at import
+import subprocess
+import argparse
+import json
+import sys
+import os
+import re
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile(module: str) -> list[dict]:
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True,
+                               env=os.environ, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if match := _LINE.match(line):
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000, "depth": len(indent) // 2})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    args = parser.parse_args()
+
+    # Once unmeasured so .pyc compilation is not counted
+    profile(args.module)
+    rows = profile(args.module)
+
+    packages: dict[str, float] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + row["self_ms"]
+
+    def table(key: str) -> list[dict]:
+        return [{"module": row["module"], key: round(row[key], 2)} for row in sorted(rows, key=lambda row: -row[key])[:args.top]]
+
+    total = next(row["cumulative_ms"] for row in rows if row["module"] == args.module)
+    print(json.dumps({
+        "module": args.module,
+        "total_ms": round(total, 2),
+        "modules_imported": len(rows),
+        "by_package_ms": {name: round(ms, 2) for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]},
+        # Direct imports of app modules, i.e. what each of our own modules pulls in
+        "app_modules_cumulative_ms": {row["module"]: round(row["cumulative_ms"], 2) for row in rows if row["module"].startswith("app.")},
+        "slowest_self": table("self_ms"),
+        "slowest_cumulative": table("cumulative_ms"),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Measure the per-request cost of the latency/DB instrumentation.
+
+Times the same requests against the app with and without
+InstrumentationMiddleware and the SQL cursor hooks, and reports the mean
+difference per request (best of several alternating rounds).
+
+    cd backend && python -m benchmarks.instrumentation_overhead
+"""
+from benchmarks.common import auth_headers, create_benchmark_engine, seed, use_engine
+from app.instrumentation import InstrumentationMiddleware, _after_cursor_execute, _before_cursor_execute, install_sql_hooks
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from sqlalchemy.engine import Engine
+from sqlalchemy import event
+from time import perf_counter
+from app.main import app
+import asyncio
+import json
+import os
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS") or 500)
+ROUNDS = int(os.getenv("BENCH_ROUNDS") or 3)
+PATHS = ["/", "/api/tasks?limit=20", "/api/tasks/1"]
+
+
+def _uninstall_sql_hooks() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _time(client: TestClient, path: str, headers: dict) -> float:
+    for _ in range(20):
+        client.get(path, headers=headers)
+    start = perf_counter()
+    for _ in range(REQUESTS):
+        client.get(path, headers=headers)
+    return (perf_counter() - start) / REQUESTS
+
+
+def _run(instrumented: bool, headers: dict) -> dict:
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not InstrumentationMiddleware]
+    _uninstall_sql_hooks()
+    if instrumented:
+        install_sql_hooks()
+        app.user_middleware.insert(0, Middleware(InstrumentationMiddleware))
+    app.middleware_stack = None  # rebuilt on the next request
+
+    with TestClient(app) as client:
+        return {path: _time(client, path, headers) for path in PATHS}
+
+
+async def _noop_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _time_asgi(asgi_app, iterations: int = 20000) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/"}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def run() -> float:
+        start = perf_counter()
+        for _ in range(iterations):
+            await asgi_app(dict(scope), receive, send)
+        return (perf_counter() - start) / iterations
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    # The middleware in isolation, without any HTTP client or database noise
+    middleware_us = (_time_asgi(InstrumentationMiddleware(_noop_app)) - _time_asgi(_noop_app)) * 1e6
+
+    engine = create_benchmark_engine()
+    seed(engine, users=10, projects=10, tasks=1000)
+    use_engine(app, engine)
+    headers = auth_headers()
+
+    # Alternate the two configurations and keep the best round of each to damp warm-up noise
+    baseline, instrumented = {}, {}
+    for _ in range(ROUNDS):
+        for best, enabled in ((baseline, False), (instrumented, True)):
+            for path, seconds in _run(enabled, headers).items():
+                best[path] = min(seconds, best.get(path, seconds))
+
+    results = [
+        {
+            "path": path,
+            "baseline_ms": round(baseline[path] * 1000, 4),
+            "instrumented_ms": round(instrumented[path] * 1000, 4),
+            "overhead_us": round((instrumented[path] - baseline[path]) * 1e6, 1),
+        }
+        for path in PATHS
+    ]
+    print(json.dumps({"middleware_only_us": round(middleware_us, 2), "requests_per_path": REQUESTS, "rounds": ROUNDS, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
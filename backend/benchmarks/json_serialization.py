@@ -0,0 +1,72 @@
+"""Compare the validated list response path with the FAST_JSON_RESPONSES orjson path.
+
+Requests a default page and a 1000 row page of tasks both ways and reports wall time,
+CPU time and peak traced memory per request, after checking both paths return the
+same JSON.
+
+    cd backend && python -m benchmarks.json_serialization --tasks 10000
+"""
+from benchmarks.common import auth_headers, create_benchmark_engine, seed, use_engine
+from fastapi.testclient import TestClient
+from time import perf_counter, process_time
+from app.main import app
+from app import fast_json
+import tracemalloc
+import argparse
+import json
+
+
+def measure(client: TestClient, url: str, headers: dict, repeat: int) -> dict:
+    wall, cpu = [], []
+    for _ in range(repeat):
+        start_wall, start_cpu = perf_counter(), process_time()
+        client.get(url, headers=headers).raise_for_status()
+        wall.append(perf_counter() - start_wall)
+        cpu.append(process_time() - start_cpu)
+
+    # Measured separately: tracing allocations slows everything down
+    tracemalloc.start()
+    response = client.get(url, headers=headers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "best_ms": round(min(wall) * 1000, 2),
+        "cpu_ms": round(min(cpu) * 1000, 2),
+        "peak_mib": round(peak / 2**20, 2),
+        "bytes": len(response.content),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed requests per path; the best is reported")
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=20, projects=50, tasks=args.tasks)
+    use_engine(app, engine)
+    headers = auth_headers()
+
+    results = {}
+    with TestClient(app) as client:
+        for url in ("/api/tasks", "/api/tasks?limit=1000"):
+            fast_json.FAST_JSON_RESPONSES = False
+            validated = client.get(url, headers=headers)
+            fast_json.FAST_JSON_RESPONSES = True
+            fast = client.get(url, headers=headers)
+            if validated.json() != fast.json() or validated.headers.get("x-next-cursor") != fast.headers.get("x-next-cursor"):
+                raise SystemExit(f"{url}: fast path response differs from the validated one")
+
+            results[url] = {}
+            for name, enabled in (("validated", False), ("orjson", True)):
+                fast_json.FAST_JSON_RESPONSES = enabled
+                results[url][name] = measure(client, url, headers, args.repeat)
+            results[url]["cpu_speedup"] = round(results[url]["validated"]["cpu_ms"] / results[url]["orjson"]["cpu_ms"], 2)
+
+    print(json.dumps({"tasks": args.tasks, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
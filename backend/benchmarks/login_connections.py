@@ -0,0 +1,66 @@
+"""Count pooled connection checkouts and commits per /api/login, rate limit checks included.
+
+Also checks that no connection is held while the password hash is verified, and exits
+non-zero if one is.
+
+    cd backend && python -m benchmarks.login_connections --logins 20
+    cd backend && RATE_LIMIT_BACKEND=postgres BENCH_DATABASE_URL=postgresql://... python -m benchmarks.login_connections
+"""
+from benchmarks.common import BENCH_PASSWORD, create_benchmark_engine, seed, use_engine
+from app.pool_metrics import db_pool_checkout_wait
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app import api, rate_limit
+import argparse
+import json
+import sys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=1, projects=1, tasks=0)
+    use_engine(app, engine)
+
+    commits = 0
+    held_during_hash = []
+    verify_password_async = api.verify_password_async
+
+    async def _verify_and_record(plain_password: str, hashed_password: str) -> bool:
+        held_during_hash.append(engine.pool.checkedout())
+        return await verify_password_async(plain_password, hashed_password)
+
+    api.verify_password_async = _verify_and_record
+
+    @event.listens_for(engine, "commit")
+    def _count_commit(conn) -> None:
+        nonlocal commits
+        commits += 1
+
+    with TestClient(app) as client:
+        # Warm-up: starts the password worker pool
+        client.post("/api/login", json={"email": "user1@bench.local", "plain_password": BENCH_PASSWORD})
+
+        checkouts_before = db_pool_checkout_wait.snapshot(pool="sync")["count"]
+        commits = 0
+        for _ in range(args.logins):
+            response = client.post("/api/login", json={"email": "user1@bench.local", "plain_password": BENCH_PASSWORD})
+            response.raise_for_status()
+        checkouts = db_pool_checkout_wait.snapshot(pool="sync")["count"] - checkouts_before
+
+    print(json.dumps({
+        "logins": args.logins,
+        "rate_limit_backend": rate_limit.RATE_LIMIT_BACKEND if rate_limit.RATE_LIMIT_ENABLED else "disabled",
+        "connection_checkouts_per_login": checkouts / args.logins,
+        "commits_per_login": commits / args.logins,
+        "max_connections_held_during_hash": max(held_during_hash),
+    }, indent=2))
+    sys.exit(1 if max(held_during_hash) else 0)
+
+
+if __name__ == "__main__":
+    main()
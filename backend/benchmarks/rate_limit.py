@@ -0,0 +1,81 @@
+"""Replay a credential stuffing burst against /api/login with and without rate limits.
+
+One address sends --attempts wrong-password logins for one account from --concurrency threads,
+while a different user logs in normally from another address. Reports, per run, how the burst was
+answered, how many bcrypt verifications it cost and the other user's login latency meanwhile.
+Addresses come from X-Forwarded-For with one trusted proxy.
+
+    cd backend && python -m benchmarks.rate_limit --attempts 300
+"""
+from benchmarks.common import BENCH_PASSWORD, create_benchmark_engine, seed, use_engine
+from concurrent.futures import ThreadPoolExecutor
+from app.passwords import password_hash_duration
+from fastapi.testclient import TestClient
+from collections import Counter
+from time import perf_counter
+from app.main import app
+from app import rate_limit
+import statistics
+import threading
+import argparse
+import json
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-ip", type=int, default=30, help="Per-minute limit per address (the app's default)")
+    parser.add_argument("--per-email", type=int, default=10, help="Per-minute limit per account (the app's default)")
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    seed(engine, users=2, projects=1, tasks=0)
+    use_engine(app, engine)
+    rate_limit.RATE_LIMIT_TRUSTED_PROXIES = 1
+    rate_limit.auth_ip_limit.per_minute = args.per_ip
+    rate_limit.auth_email_limit.per_minute = args.per_email
+
+    def login(client: TestClient, email: str, password: str, address: str) -> int:
+        return client.post("/api/login", json={"email": email, "plain_password": password}, headers={"X-Forwarded-For": address}).status_code
+
+    results = {}
+    with TestClient(app) as client:
+        # Warm-up: starts the password worker pool
+        login(client, "user2@bench.local", BENCH_PASSWORD, "10.0.0.2")
+
+        for name, enabled in (("unlimited", False), ("rate_limited", True)):
+            rate_limit.RATE_LIMIT_ENABLED = enabled
+            rate_limit.memory_store.clear()
+            verifications = password_hash_duration.snapshot(operation="verify")["count"]
+            done = threading.Event()
+            latencies = []
+
+            def legitimate() -> None:
+                while not done.is_set():
+                    start = perf_counter()
+                    if login(client, "user2@bench.local", BENCH_PASSWORD, "10.0.0.2") == 200:
+                        latencies.append(perf_counter() - start)
+
+            watcher = threading.Thread(target=legitimate)
+            watcher.start()
+            start = perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                statuses = Counter(pool.map(lambda _: login(client, "user1@bench.local", "wrong", "10.0.0.1"), range(args.attempts)))
+            elapsed = perf_counter() - start
+            done.set()
+            watcher.join()
+
+            results[name] = {
+                "burst_seconds": round(elapsed, 2),
+                "burst_statuses": {str(code): count for code, count in sorted(statuses.items())},
+                "bcrypt_verifications": password_hash_duration.snapshot(operation="verify")["count"] - verifications,
+                "other_user_logins": len(latencies),
+                "other_user_median_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+            }
+
+    print(json.dumps({"attempts": args.attempts, "concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from app.models import SEARCH_VECTOR_COLUMN
+from app.database import get_db_connection_string
+from logging.config import fileConfig
+from sqlalchemy import create_engine, pool
+from sqlmodel import SQLModel
+from alembic import context
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Importing app.models registers every table on SQLModel.metadata, so --autogenerate sees them
+target_metadata = SQLModel.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # The Postgres-only search_vector columns and GIN indexes are created by migration 0003, not mapped
+    if type_ == "column" and name == SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == "index" and name and name.endswith(f"_{SEARCH_VECTOR_COLUMN}"):
+        return False
+    return True
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        compare_type=True,
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    _configure(url=config.get_main_option("sqlalchemy.url") or get_db_connection_string(), literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # Callers (e.g. tests/test_indexes.py) can hand over an open connection instead
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or get_db_connection_string(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+    engine.dispose()
+
+
+def _run(connection) -> None:
+    # SQLite cannot ALTER most things in place; batch mode rebuilds the table instead
+    _configure(connection=connection, render_as_batch=connection.dialect.name == "sqlite")
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,102 @@
+"""initial schema
+
+The tables as they were before migrations were introduced. Existing databases already have
+them and are stamped at this revision instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _audit_columns() -> list[sa.Column]:
+    return [
+        sa.Column("created_by_email", sa.String(), nullable=False),
+        sa.Column("created_on_date", sa.DateTime(), nullable=False),
+        sa.Column("modified_by_email", sa.String(), nullable=False),
+        sa.Column("modified_on_date", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roles",
+        sa.Column("role_name", sa.String(length=50), nullable=False),
+        sa.Column("role_permissions", sa.String(), nullable=False),
+        sa.Column("role_active", sa.Boolean(), nullable=False),
+        *_audit_columns(),
+        sa.Column("role_id", sa.Integer(), primary_key=True),
+    )
+    op.create_index("ix_roles_role_name", "roles", ["role_name"], unique=True)
+
+    op.create_table(
+        "role_permissions",
+        sa.Column("role_permissions_name", sa.String(), primary_key=True),
+    )
+
+    op.create_table(
+        "task_status",
+        sa.Column("task_status_name", sa.String(length=50), nullable=False),
+        sa.Column("task_status_active", sa.Boolean(), nullable=False),
+        *_audit_columns(),
+        sa.Column("task_status_id", sa.Integer(), primary_key=True),
+    )
+    op.create_index("ix_task_status_task_status_name", "task_status", ["task_status_name"], unique=True)
+
+    op.create_table(
+        "users",
+        sa.Column("first_name", sa.String(length=30), nullable=False),
+        sa.Column("last_name", sa.String(length=30), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("provider", sa.String(length=30), nullable=False),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.role_id"), nullable=False),
+        sa.Column("user_active", sa.Boolean(), nullable=False),
+        *_audit_columns(),
+        sa.Column("user_id", sa.Integer(), primary_key=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("refresh_token", sa.String(length=1024), nullable=True),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("project_name", sa.String(length=150), nullable=False),
+        sa.Column("project_description", sa.String(), nullable=False),
+        sa.Column("project_start_date", sa.Date(), nullable=False),
+        sa.Column("project_end_date", sa.Date(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.user_id"), nullable=False),
+        sa.Column("project_active", sa.Boolean(), nullable=False),
+        *_audit_columns(),
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+    )
+
+    op.create_table(
+        "tasks",
+        sa.Column("task_description", sa.String(), nullable=False),
+        sa.Column("task_due_date", sa.Date(), nullable=False),
+        sa.Column("task_status_id", sa.Integer(), sa.ForeignKey("task_status.task_status_id"), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.user_id"), nullable=False),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.project_id"), nullable=False),
+        sa.Column("task_active", sa.Boolean(), nullable=False),
+        *_audit_columns(),
+        sa.Column("task_id", sa.Integer(), primary_key=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_task_status_task_status_name", table_name="task_status")
+    op.drop_table("task_status")
+    op.drop_table("role_permissions")
+    op.drop_index("ix_roles_role_name", table_name="roles")
+    op.drop_table("roles")
@@ -0,0 +1,55 @@
+"""list query indexes
+
+Indexes added to the models since the initial schema: the (sort column, primary key) keyset
+pagination and sync indexes, foreign key lookups, and partial indexes over active rows for the
+filtered list endpoints. On Postgres they are built CONCURRENTLY so existing tables stay writable.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _active_only(flag: str) -> dict:
+    # Same predicates as app.models._active_only
+    return {"postgresql_where": sa.text(flag), "sqlite_where": sa.text(f"{flag} = 1")}
+
+
+# (name, table, columns, partial index flag)
+INDEXES = [
+    ("ix_task_status_modified_on_date_task_status_id", "task_status", ["modified_on_date", "task_status_id"], None),
+    ("ix_users_role_id", "users", ["role_id"], None),
+    ("ix_users_modified_on_date_user_id", "users", ["modified_on_date", "user_id"], None),
+    ("ix_users_active_role_id_user_id", "users", ["role_id", "user_id"], "user_active"),
+    ("ix_projects_owner_id", "projects", ["owner_id"], None),
+    ("ix_projects_modified_on_date_project_id", "projects", ["modified_on_date", "project_id"], None),
+    ("ix_projects_active_owner_id_project_id", "projects", ["owner_id", "project_id"], "project_active"),
+    ("ix_tasks_project_id_task_id", "tasks", ["project_id", "task_id"], None),
+    ("ix_tasks_owner_id", "tasks", ["owner_id"], None),
+    ("ix_tasks_task_status_id", "tasks", ["task_status_id"], None),
+    ("ix_tasks_modified_on_date_task_id", "tasks", ["modified_on_date", "task_id"], None),
+    ("ix_tasks_active_project_id_task_id", "tasks", ["project_id", "task_id"], "task_active"),
+    ("ix_tasks_active_owner_id_task_id", "tasks", ["owner_id", "task_id"], "task_active"),
+    ("ix_tasks_active_task_status_id_task_id", "tasks", ["task_status_id", "task_id"], "task_active"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, flag in INDEXES:
+            # if_not_exists: some databases got these from create_all before migrations existed
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True, **(_active_only(flag) if flag else {}))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""search vectors
+
+Generated tsvector columns and GIN indexes behind GET /search. Postgres only: other databases
+use the in-process index in app/search.py and get nothing here.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Same expressions as the after_create DDL in app/models.py
+VECTORS = {
+    "tasks": "to_tsvector('english', coalesce(task_description, ''))",
+    "projects": "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(project_description, '')), 'B')",
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, vector in VECTORS.items():
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED")
+    with op.get_context().autocommit_block():
+        for table in VECTORS:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,50 @@
+"""role permission links
+
+The normalized role -> permission table that permission bitmasks are compiled from, backfilled
+from each role's role_permissions string (the same as ``python -m app.permissions``).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+import ast
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    links = op.create_table(
+        "role_permission_links",
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.role_id"), primary_key=True),
+        sa.Column("role_permissions_name", sa.String(), sa.ForeignKey("role_permissions.role_permissions_name"), primary_key=True),
+        if_not_exists=True,
+    )
+
+    if op.get_context().as_sql:
+        # Offline (--sql) scripts cannot read the roles; run "python -m app.permissions" afterwards
+        return
+
+    connection = op.get_bind()
+    roles = {
+        role_id: set(ast.literal_eval(permissions or "[]"))
+        for role_id, permissions in connection.execute(sa.text("SELECT role_id, role_permissions FROM roles"))
+    }
+    known = set(connection.execute(sa.text("SELECT role_permissions_name FROM role_permissions")).scalars())
+    missing = sorted(set().union(*roles.values()) - known)
+    if missing:
+        permissions = sa.table("role_permissions", sa.column("role_permissions_name"))
+        op.bulk_insert(permissions, [{"role_permissions_name": name} for name in missing])
+
+    connection.execute(sa.text("DELETE FROM role_permission_links"))
+    rows = [{"role_id": role_id, "role_permissions_name": name} for role_id, names in roles.items() for name in sorted(names)]
+    if rows:
+        op.bulk_insert(links, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("role_permission_links")
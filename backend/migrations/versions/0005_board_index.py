@@ -0,0 +1,31 @@
+"""board index
+
+Partial index matching the window functions of GET /projects/{id}/board (partitioned by status,
+ordered by task_id within one project), so the board is read in order instead of sorted.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+NAME = "ix_tasks_active_project_id_task_status_id_task_id"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            NAME, "tasks", ["project_id", "task_status_id", "task_id"], if_not_exists=True, postgresql_concurrently=True,
+            postgresql_where=sa.text("task_active"), sqlite_where=sa.text("task_active = 1")
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(NAME, table_name="tasks", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""rate limit buckets
+
+Token buckets for RATE_LIMIT_BACKEND=postgres. UNLOGGED there: losing the buckets in a
+crash only resets the limits, and writes skip the WAL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    prefixes = ["UNLOGGED"] if op.get_context().dialect.name == "postgresql" else []
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("bucket_key", sa.String(length=64), primary_key=True),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.Float(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        if_not_exists=True,
+        prefixes=prefixes,
+    )
+    op.create_index("ix_rate_limit_buckets_updated_at", "rate_limit_buckets", ["updated_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_buckets_updated_at", table_name="rate_limit_buckets", if_exists=True)
+    op.drop_table("rate_limit_buckets")
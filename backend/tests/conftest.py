@@ -0,0 +1,31 @@
+"""Fixtures running the app against a throwaway SQLite database, set up the same way as the benchmarks.
+
+The test client needs httpx: ``pip install -r requirements-bench.txt``.
+"""
+from benchmarks.common import auth_headers, create_benchmark_engine, seed, use_engine
+from fastapi.testclient import TestClient
+from app.conditional import invalidate_reference_data
+from app.search import invalidate_search_index
+from app.stats import invalidate_task_stats
+from app.utils import user_revocation_cache
+from app.main import app
+import pytest
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_benchmark_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    seed(engine, users=3, projects=3, tasks=30)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    use_engine(app, engine)
+    # Process-wide caches would otherwise carry rows over from the previous test's database
+    for invalidate in (invalidate_reference_data, invalidate_search_index, invalidate_task_stats, user_revocation_cache.clear):
+        invalidate()
+    with TestClient(app, headers=auth_headers()) as client:
+        yield client
+    app.dependency_overrides.clear()
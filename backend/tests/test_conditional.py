@@ -0,0 +1,28 @@
+from app.models import ReadTaskStatus
+from sqlmodel import Session
+
+
+def test_echoed_modified_on_date_changes_the_etag(client):
+    first = client.get("/api/taskstatus")
+    status = first.json()[0]
+
+    # The client sends back the row it read, old modified_on_date included
+    client.post("/api/update_taskstatus", json={**status, "task_status_name": "Backlog"}).raise_for_status()
+
+    second = client.get("/api/taskstatus", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()[0]["task_status_name"] == "Backlog"
+
+
+def test_writes_from_other_workers_are_seen_at_once(client, engine):
+    first = client.get("/api/taskstatus")
+
+    # Written outside the app, so nothing in this process invalidates its cache
+    with Session(engine) as session:
+        session.add(ReadTaskStatus(task_status_name="Blocked"))
+        session.commit()
+
+    second = client.get("/api/taskstatus", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert "Blocked" in [row["task_status_name"] for row in second.json()]
+    assert client.get("/api/taskstatus", headers={"If-None-Match": second.headers["etag"]}).status_code == 304
@@ -0,0 +1,38 @@
+from starlette.websockets import WebSocketDisconnect
+from app.events import bus, iter_sse
+import asyncio
+import pytest
+
+
+def test_websocket_closes_on_invalid_subscribe_message(client):
+    with client.websocket_connect("/api/ws/events") as websocket:
+        websocket.send_json({"type": "subscribe", "project_ids": ["x"]})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1003
+    assert len(bus) == 0
+
+
+def test_change_arriving_after_a_timeout_is_not_lost():
+    async def scenario():
+        subscription = bus.subscribe()
+        try:
+            assert await subscription.get(0.01) is None
+            subscription.offer({"type": "change", "seq": 1})
+            assert await subscription.get(1) == {"type": "change", "seq": 1}
+        finally:
+            bus.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_sse_subscribes_only_once_streaming_starts():
+    async def scenario():
+        stream = iter_sse([1])
+        assert len(bus) == 0
+        assert await anext(stream) == "retry: 3000\n\n"
+        assert len(bus) == 1
+        await stream.aclose()
+        assert len(bus) == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,28 @@
+from sqlalchemy import event
+import pytest
+
+
+@pytest.mark.parametrize("path, expand", [
+    ("/api/tasks", "owner,status,project"),
+    ("/api/projects/1/tasks", "owner,status,project"),
+    ("/api/projects", "owner"),
+])
+def test_expand_uses_constant_number_of_statements(client, engine, path, expand):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    # Warms the auth cache and permissions, so only the endpoint's own statements are counted
+    client.get(path, params={"limit": 1}).raise_for_status()
+
+    counts = {}
+    for limit in (1, 3):
+        statements.clear()
+        response = client.get(path, params={"expand": expand, "limit": limit})
+        response.raise_for_status()
+        assert len(response.json()) == limit
+        counts[limit] = len(statements)
+    assert counts[1] == counts[3]
+
+
+def test_project_tasks_are_not_expandable(client):
+    response = client.get("/api/projects", params={"expand": "tasks"})
+    assert response.status_code == 400
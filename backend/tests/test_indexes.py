@@ -0,0 +1,128 @@
+"""Check that the schema built by the migrations serves the list queries from indexes.
+
+Builds a database with ``alembic upgrade head``, checks it matches the models (no
+autogenerate drift), seeds it, then EXPLAINs each list endpoint's query as built by
+the app and fails unless the plan reads one of the expected indexes without a
+separate sort. Needs a Postgres database it may drop and rebuild, given as
+TEST_DATABASE_URL; skipped without one.
+
+    cd backend && TEST_DATABASE_URL=postgresql+psycopg2://... python -m pytest tests/test_indexes.py
+"""
+from benchmarks.common import seed
+from app.models import ReadProject, ReadTask, ReadUser, SEARCH_VECTOR_COLUMN
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from alembic.config import Config
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlmodel import SQLModel, select
+from app.board import BoardParams, _board_statement
+from app.pagination import PageParams
+from app.api import task_filters
+import pytest
+import os
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"), reason="TEST_DATABASE_URL is not a Postgres database"
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRIMARY_KEY = "primary key"
+
+# name -> (table model, filters, sort, indexes any of which the plan may use)
+QUERIES = {
+    "GET /tasks": (ReadTask, task_filters(), "id", (PRIMARY_KEY,)),
+    "GET /tasks?owner_id=": (ReadTask, task_filters(owner_id=3), "id", ("ix_tasks_active_owner_id_task_id",)),
+    "GET /tasks?task_status_id=": (ReadTask, task_filters(task_status_id=2), "id", ("ix_tasks_active_task_status_id_task_id", PRIMARY_KEY)),
+    "GET /tasks?sort=modified_on_date": (ReadTask, task_filters(), "modified_on_date", ("ix_tasks_modified_on_date_task_id",)),
+    "GET /projects/{id}/tasks": (ReadTask, [*task_filters(), ReadTask.project_id == 7], "id", ("ix_tasks_active_project_id_task_id",)),
+    "GET /projects": (ReadProject, [ReadProject.project_active == True], "id", (PRIMARY_KEY,)),
+    "GET /projects?owner_id=": (ReadProject, [ReadProject.project_active == True, ReadProject.owner_id == 3], "id", ("ix_projects_active_owner_id_project_id", "ix_projects_owner_id")),
+    "GET /users": (ReadUser, [ReadUser.user_active == True], "id", (PRIMARY_KEY,)),
+    "GET /users?role_id=": (ReadUser, [ReadUser.user_active == True, ReadUser.role_id == 1], "id", ("ix_users_active_role_id_user_id", PRIMARY_KEY)),
+}
+# Queries not built by PageParams.apply: name -> (statement factory, indexes any of which the plan may use)
+STATEMENTS = {
+    "GET /projects/{id}/board": (
+        lambda: _board_statement(7, task_filters(), BoardParams(limit=20, cursor=None, task_status_id=None, sort="id", order="asc")),
+        ("ix_tasks_active_project_id_task_status_id_task_id",)
+    ),
+}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # Mirrors migrations/env.py: the search vectors exist only in the database
+    return not (name and (name == SEARCH_VECTOR_COLUMN or name.endswith(f"_{SEARCH_VECTOR_COLUMN}")))
+
+
+def migrate(engine) -> list:
+    SQLModel.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
+
+        context = MigrationContext.configure(connection, opts={"include_object": include_object, "compare_type": True})
+        return compare_metadata(context, SQLModel.metadata)
+
+
+def _postgres_plan(connection, sql: str) -> tuple[set[str], list[str]]:
+    used, problems = set(), []
+    (plan,) = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+
+    def walk(node: dict) -> None:
+        if "Index Name" in node:
+            used.add(PRIMARY_KEY if node["Index Name"].endswith("_pkey") else node["Index Name"])
+        if node["Node Type"] in ("Seq Scan", "Sort", "Incremental Sort"):
+            problems.append(f"{node['Node Type']} on {node.get('Relation Name', node.get('Sort Key'))}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return used, problems
+
+
+def _statement(name: str):
+    if name in QUERIES:
+        obj, filters, sort, expected = QUERIES[name]
+        return PageParams(limit=100, cursor=None, sort=sort, order="asc").apply(select(obj).where(*filters), obj), expected
+    factory, expected = STATEMENTS[name]
+    return factory(), expected
+
+
+@pytest.fixture(scope="module")
+def migrated():
+    engine = create_engine(TEST_DATABASE_URL)
+    drift = migrate(engine)
+    seed(engine, users=50, projects=200, tasks=50000)
+    with engine.begin() as connection:
+        # Some inactive rows, so the partial indexes are smaller than the tables as in production
+        connection.execute(text("UPDATE tasks SET task_active = false WHERE task_id % 5 = 0"))
+        connection.execute(text("UPDATE projects SET project_active = false WHERE project_id % 7 = 0"))
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        connection.commit()
+    yield engine, drift
+    engine.dispose()
+
+
+def test_migrations_match_models(migrated):
+    _, drift = migrated
+    assert [str(diff) for diff in drift] == []
+
+
+@pytest.mark.parametrize("name", [*QUERIES, *STATEMENTS])
+def test_list_query_reads_an_index(migrated, name):
+    engine, _ = migrated
+    statement, expected = _statement(name)
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        used, problems = _postgres_plan(connection, sql)
+    assert used & set(expected), f"expected one of {list(expected)}, plan used {sorted(used)}"
+    assert problems == []
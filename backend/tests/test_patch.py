@@ -0,0 +1,12 @@
+def test_patch_returns_the_stored_version(client):
+    version = client.get("/api/tasks/1").json()["modified_on_date"]
+
+    first = client.patch("/api/tasks", json=[{"task_id": 1, "modified_on_date": version, "task_status_id": 2}]).json()
+    stored = client.get("/api/tasks/1").json()["modified_on_date"]
+    assert first["rows"][0]["modified_on_date"] == stored
+
+    # The version a patch returns is accepted by the next one; the one it replaced is not
+    second = client.patch("/api/tasks", json=[{"task_id": 1, "modified_on_date": stored, "task_status_id": 3}]).json()
+    assert second["updated"] == 1
+    stale = client.patch("/api/tasks", json=[{"task_id": 1, "modified_on_date": version, "task_status_id": 4}]).json()
+    assert stale["conflicts"][0]["reason"] == "version_mismatch"
@@ -0,0 +1,30 @@
+from starlette.requests import Request
+from app import rate_limit
+
+
+def make_request(forwarded_for: str | None = None, peer: str = "10.0.0.1") -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+    return Request({"type": "http", "method": "POST", "path": "/api/login", "headers": headers, "client": (peer, 4321)})
+
+
+def test_client_ip_uses_peer_address_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    assert rate_limit.client_ip(make_request("203.0.113.7")) == "10.0.0.1"
+
+
+def test_client_ip_takes_address_appended_by_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+    assert rate_limit.client_ip(make_request("203.0.113.7")) == "203.0.113.7"
+    # Entries the client sent itself come before the proxy's and are ignored
+    assert rate_limit.client_ip(make_request("198.51.100.1, 203.0.113.7")) == "203.0.113.7"
+
+
+def test_client_ip_skips_each_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+    assert rate_limit.client_ip(make_request("198.51.100.1, 203.0.113.7, 192.0.2.10")) == "203.0.113.7"
+
+
+def test_client_ip_falls_back_to_peer_when_header_is_short(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+    assert rate_limit.client_ip(make_request("203.0.113.7")) == "10.0.0.1"
+    assert rate_limit.client_ip(make_request()) == "10.0.0.1"
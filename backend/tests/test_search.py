@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+from fastapi import HTTPException
+from app import search
+import pytest
+
+
+def test_search_uses_in_process_index_on_sqlite(client):
+    response = client.get("/api/search", params={"q": "project 2", "type": "projects"})
+    assert [row["id"] for row in response.json()] == [2]
+
+
+def test_postgres_without_search_vectors_is_unavailable(monkeypatch):
+    session = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    monkeypatch.setattr(search, "search_vectors_available", lambda session: False)
+    monkeypatch.setattr(search.search_index, "search", lambda *args: pytest.fail("searched the in-process index"))
+
+    params = search.SearchParams(q="docs", type="all", project_id=None, limit=20, cursor=None)
+    with pytest.raises(HTTPException) as raised:
+        search.search(session, params)
+    assert raised.value.status_code == 503
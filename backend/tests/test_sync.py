@@ -0,0 +1,31 @@
+from benchmarks.common import PERMISSIONS
+from app.permissions import CompiledPermissions
+from app.models import JWTPayloadBase
+from app.utils import create_access_token
+from app import sync
+
+
+def test_echoed_modified_on_date_still_reaches_synced_clients(client, monkeypatch):
+    monkeypatch.setattr(sync, "SYNC_SETTLE_SECONDS", 0)
+    first = client.get("/api/sync", params={"entities": "tasks", "limit": 5000}).json()
+    assert not first["has_more"]
+
+    # The client sends back the row it read, old modified_on_date included
+    task = client.get("/api/tasks/1").json()
+    client.post("/api/update_taskstatus_in_task", json={**task, "task_status_id": 4}).raise_for_status()
+
+    changes = client.get("/api/sync", params={"since": first["cursor"], "entities": "tasks"}).json()
+    assert [(row["task_id"], row["task_status_id"]) for row in changes["tasks"]["upserts"]] == [(1, 4)]
+
+
+def test_default_entities_are_those_the_token_can_view(client):
+    compiled = CompiledPermissions(PERMISSIONS)
+    token = create_access_token(JWTPayloadBase(
+        user_id=1, first_name="User1", last_name="Bench", email="user1@bench.local", role_name="admin",
+        permission_mask=compiled.mask(["view_task", "view_project"]), permission_version=compiled.version
+    ))
+
+    response = client.get("/api/sync", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert {"tasks", "projects"} == set(response.json()) - {"cursor", "has_more"}
+    assert client.get("/api/sync", params={"entities": "users"}, headers={"Authorization": f"Bearer {token}"}).status_code == 403
@@ -9,17 +9,16 @@ type DecodedTokenRaw = {
   last_name: string;
   email: string;
   role_name: string;
-  role_permissions: string; // raw string from JWT
 };
 
 type DecodedToken = DecodedTokenRaw & {
-  role_permissions_parsed: string[]; // parsed array
+  role_permissions_parsed: string[]; // from the login response; the JWT only carries a bitmask
 };
 
 type AuthContextType = {
   token: string | null;
   user: DecodedToken | null;
-  login: (token: string) => void;
+  login: (token: string, permissions: string[]) => void;
   logout: () => void;
 };
 
@@ -36,36 +35,23 @@ type AuthProviderProps = {
   children: ReactNode;
 };
 
-const parsePermissions = (permString: string): string[] => {
-  try {
-    if (!permString) return [];
-    return permString
-      .replace(/^\[|\]$/g, "")
-      .split(",")
-      .map((p) => p.trim().replace(/^['"]|['"]$/g, ""))
-      .filter(Boolean);
-  } catch {
-    return [];
-  }
-};
-
 export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   const [token, setTokenState] = useState<string | null>(null);
   const [user, setUser] = useState<DecodedToken | null>(null);
 
-  const decodeAndSetUser = (jwt: string) => {
+  const decodeAndSetUser = (jwt: string, permissions: string[]) => {
     const raw = jwtDecode<DecodedTokenRaw>(jwt);
     const parsed: DecodedToken = {
       ...raw,
-      role_permissions_parsed: parsePermissions(raw.role_permissions),
+      role_permissions_parsed: permissions ?? [],
     };
     setUser(parsed);
   };
 
-  const login = (newToken: string) => {
+  const login = (newToken: string, permissions: string[]) => {
     setTokenState(newToken);
     setGlobalToken(newToken);
-    decodeAndSetUser(newToken);
+    decodeAndSetUser(newToken, permissions);
   };
 
   const logout = async () => {
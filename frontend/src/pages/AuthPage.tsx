@@ -77,7 +77,7 @@ const AuthPage = () => {
         email: form.email,
         plain_password: form.plain_password,
       });
-      login(data.access_token);
+      login(data.access_token, data.permissions);
     } catch (err: unknown) {
       if (axios.isAxiosError(err) && err.response) {
         setError(err.response.data?.detail || "Login failed");
@@ -153,7 +153,7 @@ const AuthPage = () => {
         setMode("register");
         setLoadingGoogle(false);
       } else if (data.access_token) {
-        login(data.access_token);
+        login(data.access_token, data.permissions);
         setLoadingGoogle(false);
       }
     } catch (err: unknown) {
@@ -0,0 +1,18 @@
+import AxiosInstance from "./AxiosInstance";
+
+// Largest page the list endpoints serve
+const PAGE_LIMIT = 1000;
+
+// List endpoints return one page at a time; follow X-Next-Cursor until the last one
+export const fetchAllPages = async <T = any>(url: string): Promise<T[]> => {
+  const rows: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await AxiosInstance.get<T[]>(url, {
+      params: cursor ? { limit: PAGE_LIMIT, cursor } : { limit: PAGE_LIMIT },
+    });
+    rows.push(...response.data);
+    cursor = response.headers["x-next-cursor"] as string | undefined;
+  } while (cursor);
+  return rows;
+};
@@ -1,4 +1,5 @@
 import AxiosInstance from "./AxiosInstance";
+import { fetchAllPages } from "./Pagination";
 
 export type ProjectModel = {
   project_id: number;
@@ -13,8 +14,7 @@ export type ProjectModel = {
 };
 
 export const fetchProjects = async () => {
-  const response = await AxiosInstance.get(`/api/projects`);
-  return response.data;
+  return fetchAllPages<ProjectModel>(`/api/projects`);
 };
 
 export const fetchProjectByID = async (project_id: number) => {
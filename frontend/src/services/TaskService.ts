@@ -1,4 +1,5 @@
 import AxiosInstance from "./AxiosInstance";
+import { fetchAllPages } from "./Pagination";
 
 export type TaskModel = {
   task_id: number;
@@ -13,8 +14,7 @@ export type TaskModel = {
 };
 
 export const fetchTasks = async () => {
-  const response = await AxiosInstance.get(`/api/tasks`);
-  return response.data;
+  return fetchAllPages<TaskModel>(`/api/tasks`);
 };
 
 export const fetchTaskByID = async (task_id: number) => {
@@ -50,6 +50,5 @@ export const updateTaskStatusInTask = async (
 };
 
 export const fetchTasksByProjectID = async (project_id: number) => {
-  const response = await AxiosInstance.get(`/api/projects/${project_id}/tasks`);
-  return response.data;
+  return fetchAllPages<TaskModel>(`/api/projects/${project_id}/tasks`);
 };
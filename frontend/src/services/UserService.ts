@@ -1,4 +1,5 @@
 import AxiosInstance from "./AxiosInstance";
+import { fetchAllPages } from "./Pagination";
 
 export type UserModel = {
   user_id: number;
@@ -13,8 +14,7 @@ export type UserModel = {
 };
 
 export const fetchUsers = async () => {
-  const response = await AxiosInstance.get(`/api/users`);
-  return response.data;
+  return fetchAllPages<UserModel>(`/api/users`);
 };
 
 export const fetchUserByID = async (user_id: number) => {